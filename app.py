@@ -103,9 +103,11 @@ try:
     t0 = None
     import time as _time
     t0 = _time.perf_counter()
-    WHISPER_SERVICE = WhisperService(app.config['UPLOAD_FOLDER'], model_name='base')
+    WHISPER_SERVICE = WhisperService(app.config['UPLOAD_FOLDER'], model_name='base', load_on_init=False)
+    # Model load + first inference run in the background; see /health/ready
+    WHISPER_SERVICE.start_warmup()
     t1 = _time.perf_counter()
-    logger.info(f"Whisper initialized in {t1 - t0:.2f}s; device: {WHISPER_SERVICE.device}")
+    logger.info(f"Whisper initialized in {t1 - t0:.2f}s (warming up); device: {WHISPER_SERVICE.device}")
 except Exception as e:
     logger.warning(f"Whisper initialization failed: {e}")
 
@@ -1194,6 +1196,20 @@ def translate():
     
     return jsonify({'error': 'No text provided'}), 400
 
+@app.route('/health')
+def health():
+    """Liveness probe"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/health/ready')
+def health_ready():
+    """Readiness probe: 503 until the Whisper warmup has finished"""
+    whisper_ready = WHISPER_SERVICE is None or WHISPER_SERVICE.is_ready()
+    return jsonify({
+        'status': 'ready' if whisper_ready else 'warming_up',
+        'whisper_ready': whisper_ready
+    }), 200 if whisper_ready else 503
+
 @app.route('/rag/status')
 @login_required
 def rag_status():
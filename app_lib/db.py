@@ -5,9 +5,9 @@ Database operations for the Document Analyzer application using PostgreSQL and S
 from datetime import datetime
 import os
 import logging
-from sqlalchemy import text, func
+from sqlalchemy import create_engine, text, func
 from sqlalchemy.exc import SQLAlchemyError
-from app_lib.models import db, User, Document, ChatMessage, init_database
+from app_lib.models import db, User, Document, ChatMessage, init_database, create_fulltext_indexes
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +39,31 @@ def init_db(app=None):
         logger.error(f"Failed to initialize database: {str(e)}")
         return False
 
+def create_all(uri=None):
+    """Create all tables and indexes directly through a SQLAlchemy engine
+    
+    Unlike init_db this does not need a Flask app instance or app context,
+    so maintenance scripts can create the schema without building the app
+    (flask_sqlalchemy is still imported, for the model definitions).
+    """
+    engine = create_engine(uri or POSTGRES_URI)
+    try:
+        db.metadata.create_all(engine)
+        
+        try:
+            create_fulltext_indexes(engine)
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not create full-text search indexes: {str(e)}")
+        
+        logger.info("Database tables created successfully")
+        return True
+        
+    except SQLAlchemyError as e:
+        logger.error(f"Failed to create database tables: {str(e)}")
+        return False
+    finally:
+        engine.dispose()
+
 def seed_users():
     """Seed the database with test users"""
     from app_lib.auth import hash_password
@@ -0,0 +1,26 @@
+"""
+Installed-package checks shared by the setup and startup scripts
+
+importlib.util.find_spec only asks the import system where a module would
+be loaded from; unlike a real import it runs none of the package's
+top-level code, so probing torch or transformers costs a few stat calls.
+"""
+
+import functools
+import importlib.util
+from typing import Iterable, List
+
+
+@functools.lru_cache(maxsize=None)
+def has(module_name: str) -> bool:
+    """Whether a module is installed, without importing it (cached per process)"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        # Dotted names import their parent package, which may be missing or broken
+        return False
+
+
+def missing(module_names: Iterable[str]) -> List[str]:
+    """The names in module_names that are not installed"""
+    return [name for name in module_names if not has(name)]
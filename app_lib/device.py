@@ -0,0 +1,198 @@
+"""
+CUDA availability probe for the startup and ingestion scripts
+
+Importing torch just to call torch.cuda.is_available() costs seconds on a
+cold start. The probe here talks to the CUDA driver directly through ctypes
+(tens of milliseconds) and caches the answer on disk, keyed by the driver
+state, so repeated script launches skip even that.
+"""
+
+import ctypes
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from importlib.util import find_spec
+
+logger = logging.getLogger(__name__)
+
+# Result of cuda_available(), inherited by child processes and later imports
+CUDA_ENV_FLAG = '_OMANBOT_HAS_CUDA'
+
+PROBE_CACHE_PATH = os.path.join(tempfile.gettempdir(), '.omanbot_gpu_probe.json')
+
+# Re-probe at least this often even if the driver fingerprint is unchanged
+PROBE_CACHE_TTL = 24 * 60 * 60
+
+_CUDA_LIBRARIES = ('nvcuda.dll',) if os.name == 'nt' else ('libcuda.so.1', 'libcuda.so')
+_NVIDIA_DRIVER_VERSION = '/proc/driver/nvidia/version'
+
+
+def _driver_fingerprint() -> str:
+    """Identify the driver / visible-device state the cached probe applies to"""
+    try:
+        driver_mtime = os.stat(_NVIDIA_DRIVER_VERSION).st_mtime_ns
+    except OSError:
+        driver_mtime = None
+    return f"{os.environ.get('CUDA_VISIBLE_DEVICES', '')}|{driver_mtime}"
+
+
+def _probe_driver() -> dict:
+    """Ask the CUDA driver API for the device count and first device name"""
+    for name in _CUDA_LIBRARIES:
+        try:
+            libcuda = ctypes.CDLL(name)
+        except OSError:
+            continue
+
+        if libcuda.cuInit(0) != 0:
+            return {'available': False, 'count': 0, 'name': None}
+
+        count = ctypes.c_int(0)
+        if libcuda.cuDeviceGetCount(ctypes.byref(count)) != 0 or count.value == 0:
+            return {'available': False, 'count': 0, 'name': None}
+
+        device = ctypes.c_int(0)
+        buffer = ctypes.create_string_buffer(256)
+        gpu_name = None
+        if libcuda.cuDeviceGet(ctypes.byref(device), 0) == 0 and \
+                libcuda.cuDeviceGetName(buffer, len(buffer), device) == 0:
+            gpu_name = buffer.value.decode(errors='replace')
+        return {'available': True, 'count': count.value, 'name': gpu_name}
+
+    # No driver library at all: no usable CUDA device
+    return {'available': False, 'count': 0, 'name': None}
+
+
+def _probe_torch() -> dict:
+    """Fallback probe through torch when the driver API cannot be queried"""
+    try:
+        import torch
+        if torch.cuda.is_available():
+            return {
+                'available': True,
+                'count': torch.cuda.device_count(),
+                'name': torch.cuda.get_device_name(0),
+            }
+    except Exception:
+        pass
+    return {'available': False, 'count': 0, 'name': None}
+
+
+def _read_cache(fingerprint: str):
+    try:
+        with open(PROBE_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get('fingerprint') != fingerprint:
+        return None
+    if time.time() - cached.get('probed_at', 0) > PROBE_CACHE_TTL:
+        return None
+    return cached.get('info')
+
+
+def _write_cache(fingerprint: str, info: dict):
+    try:
+        tmp_path = f"{PROBE_CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint, 'probed_at': time.time(), 'info': info}, f)
+        os.replace(tmp_path, PROBE_CACHE_PATH)
+    except OSError as e:
+        logger.debug(f"Could not write GPU probe cache: {e}")
+
+
+def get_cuda_info(refresh: bool = False) -> dict:
+    """
+    Describe the CUDA devices visible to this process
+
+    Args:
+        refresh: Ignore the on-disk cache and probe again
+
+    Returns:
+        Dict with 'available' (bool), 'count' (int) and 'name' (str or None)
+    """
+    fingerprint = _driver_fingerprint()
+    if not refresh:
+        cached = _read_cache(fingerprint)
+        if cached is not None:
+            return cached
+
+    try:
+        info = _probe_driver()
+    except Exception as e:
+        logger.debug(f"CUDA driver probe failed, falling back to torch: {e}")
+        info = _probe_torch()
+
+    _write_cache(fingerprint, info)
+    return info
+
+
+def torch_has_cuda_build() -> bool:
+    """Whether the installed torch wheel was built with CUDA, without importing torch
+
+    A CUDA driver is useless to a CPU-only torch build, so the device choice
+    also needs this. torch/version.py records the CUDA version it was built
+    against (None for CPU wheels).
+    """
+    spec = find_spec('torch')
+    if spec is None or not spec.submodule_search_locations:
+        return False
+    version_file = os.path.join(list(spec.submodule_search_locations)[0], 'version.py')
+    try:
+        with open(version_file, 'r', encoding='utf-8') as f:
+            match = re.search(r"^cuda\s*(?::[^=]*)?=\s*(.+)$", f.read(), re.MULTILINE)
+    except OSError:
+        return False
+    return bool(match) and match.group(1).strip() not in ('None', "''", '""')
+
+
+def cuda_available() -> bool:
+    """
+    Whether torch can use at least one CUDA device
+
+    The answer is cached in the CUDA_ENV_FLAG environment variable so the app
+    (and any subprocess) started after the run scripts reuses it.
+    """
+    cached = os.environ.get(CUDA_ENV_FLAG)
+    if cached in ('0', '1'):
+        return cached == '1'
+
+    has_cuda = get_cuda_info()['available'] and torch_has_cuda_build()
+    os.environ[CUDA_ENV_FLAG] = '1' if has_cuda else '0'
+    return has_cuda
+
+
+def physical_cpu_count() -> int:
+    """
+    Physical CPU cores usable by this process
+
+    Hyperthread siblings share a core's caches and FPUs, so BLAS/OpenMP
+    pools sized to the logical count only contend with each other. Uses
+    psutil when installed, otherwise /proc/cpuinfo, and never exceeds the
+    process's CPU affinity.
+    """
+    count = None
+    try:
+        import psutil
+        count = psutil.cpu_count(logical=False)
+    except ImportError:
+        try:
+            cores = set()
+            physical_id = None
+            with open('/proc/cpuinfo', 'r', encoding='utf-8') as f:
+                for line in f:
+                    key, _, value = line.partition(':')
+                    key = key.strip()
+                    if key == 'physical id':
+                        physical_id = value.strip()
+                    elif key == 'core id':
+                        cores.add((physical_id, value.strip()))
+            count = len(cores) or None
+        except OSError:
+            pass
+
+    logical = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+    return max(1, min(count or logical or 1, logical or 1))
@@ -1,6 +1,7 @@
 import os
 import logging
 import time
+from functools import lru_cache
 from typing import Optional, List
 import google.generativeai as genai
 from app_lib.extract import chunk_text
@@ -51,6 +52,7 @@ DEPARTMENT_KEYWORDS = {
     ]
 }
 
+@lru_cache(maxsize=4096)
 def get_department_focus(department):
     """Get department focus areas in English"""
     if department not in DEPARTMENT_KEYWORDS:
@@ -87,6 +89,7 @@ DEPARTMENT_KEYWORDS_ARABIC = {
     ]
 }
 
+@lru_cache(maxsize=4096)
 def get_department_focus_arabic(department):
     """Get department focus areas in Arabic"""
     if department not in DEPARTMENT_KEYWORDS_ARABIC:
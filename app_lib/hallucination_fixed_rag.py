@@ -18,6 +18,7 @@ from langchain.chains import RetrievalQA
 from langchain.prompts import PromptTemplate
 from langchain_community.llms import HuggingFacePipeline
 from langchain_huggingface import HuggingFaceEmbeddings
+from safetensors.torch import save_model, load_model
 import logging
 import warnings
 
@@ -27,6 +28,13 @@ warnings.filterwarnings('ignore', message='.*Cannot set gray stroke color.*')
 
 logger = logging.getLogger(__name__)
 
+# Hugging Face hub models used by this backend
+EMBEDDING_MODEL_NAME = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+LLM_MODEL_NAME = "tiiuae/Falcon-H1-1B-Base"
+
+# File extensions the RAG ingester understands, mapped to process_document filetypes
+SUPPORTED_FILETYPES = {'.pdf': 'pdf', '.txt': 'txt', '.md': 'md'}
+
 class DocumentProcessor:
     def __init__(self):
         self.ocr_lang = 'eng+ara'
@@ -37,10 +45,8 @@ class DocumentProcessor:
         text = ""
         try:
             with pdfplumber.open(filepath) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+                page_texts = (page.extract_text() for page in pdf.pages)
+                text = "".join(page_text + "\n" for page_text in page_texts if page_text)
         except Exception as e:
             logger.error(f"Error extracting text from PDF {filepath}: {str(e)}")
         return text
@@ -69,16 +75,16 @@ class DocumentProcessor:
             return ""
 
     def translate_text_in_chunks(self, text, dest='en', chunk_size=4000):
-        translated_text = ""
+        translated_chunks = []
         translator = self.translator_en if dest == 'en' else self.translator_ar
         for i in range(0, len(text), chunk_size):
             chunk = text[i:i + chunk_size]
             try:
-                translated_text += translator.translate(chunk)
+                translated_chunks.append(translator.translate(chunk))
             except Exception as e:
                 logger.warning(f"Error translating chunk: {e}")
-                translated_text += chunk
-        return translated_text
+                translated_chunks.append(chunk)
+        return "".join(translated_chunks)
 
     def process_document(self, filepath, filetype='pdf'):
         try:
@@ -127,7 +133,7 @@ def get_llm():
             return None, None
         
         logger.info("✅ GPU detected. Loading Falcon model...")
-        model_name = "tiiuae/Falcon-H1-1B-Base"
+        model_name = LLM_MODEL_NAME
         tokenizer = AutoTokenizer.from_pretrained(model_name)
         model = AutoModelForCausalLM.from_pretrained(
             model_name,
@@ -149,6 +155,12 @@ def get_llm():
         return None, None
 
 
+def _safetensors_path(path):
+    """Map a .pth weights path to the .safetensors file actually written"""
+    root, ext = os.path.splitext(path)
+    return root + '.safetensors' if ext == '.pth' else path
+
+
 # Import prompt template from the centralized module
 from app_lib.prompt_templates import RAG_PROMPT_TEMPLATE
 
@@ -161,11 +173,11 @@ class HallucinationFixedRAG:
         self.upload_folder = upload_folder
         self.processor = DocumentProcessor()
         self.tagger = DepartmentTagger()
-        self.embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/paraphrase-multilingual-mpnet-base-v2")
+        self.embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_NAME)
         self.vector_store = None
         self.llm, self.model = get_llm()
         self.qa_chain = None
-        self.weights_path = os.path.join(upload_folder, "falcon_h1_weights.pth")
+        self.weights_path = os.path.join(upload_folder, "falcon_h1_weights.safetensors")
         self.is_ready_flag = False
 
     def is_ready(self):
@@ -194,15 +206,11 @@ class HallucinationFixedRAG:
             file_extension = os.path.splitext(filename)[1].lower()
             
             # Process the document
-            if file_extension == ".pdf":
-                _, text_en, sum_en, sum_ar = self.processor.process_document(file_path, 'pdf')
-            elif file_extension == ".txt":
-                _, text_en, sum_en, sum_ar = self.processor.process_document(file_path, 'txt')
-            elif file_extension == ".md":
-                _, text_en, sum_en, sum_ar = self.processor.process_document(file_path, 'md')
-            else:
+            filetype = SUPPORTED_FILETYPES.get(file_extension)
+            if not filetype:
                 logger.warning(f"⚠️ RAG: Unsupported file type: {file_extension}")
                 return False
+            _, text_en, sum_en, sum_ar = self.processor.process_document(file_path, filetype)
             
             if not text_en or not text_en.strip():
                 logger.warning(f"⚠️ RAG: No text extracted from {filename}")
@@ -213,7 +221,6 @@ class HallucinationFixedRAG:
             logger.info(f"🏢 RAG: Department assigned: {depts}")
             
             # Split text into chunks
-            from langchain.text_splitter import RecursiveCharacterTextSplitter
             splitter = RecursiveCharacterTextSplitter(chunk_size=800, chunk_overlap=100)
             chunks = splitter.split_text(text_en)
             logger.info(f"📦 RAG: Created {len(chunks)} chunks for {filename}")
@@ -222,7 +229,6 @@ class HallucinationFixedRAG:
             documents = []
             for i, chunk in enumerate(chunks):
                 if chunk.strip():
-                    from langchain_core.documents import Document
                     doc = Document(
                         page_content=chunk,
                         metadata={
@@ -241,14 +247,12 @@ class HallucinationFixedRAG:
             
             # Add to vector store
             if self.vector_store:
-                logger.info(f"🔄 RAG: Merging {len(documents)} documents with existing vector store")
-                from langchain_community.vectorstores import FAISS
-                new_vector_store = FAISS.from_documents(documents, self.embeddings)
-                self.vector_store.merge_from(new_vector_store)
-                logger.info(f"✅ RAG: Successfully merged documents with existing vector store")
+                logger.info(f"🔄 RAG: Adding {len(documents)} documents to existing vector store")
+                # Embed the batch once and append it straight into the existing index
+                self.vector_store.add_documents(documents)
+                logger.info(f"✅ RAG: Successfully added documents to existing vector store")
             else:
                 logger.info(f"🆕 RAG: Creating new vector store with {len(documents)} documents")
-                from langchain_community.vectorstores import FAISS
                 self.vector_store = FAISS.from_documents(documents, self.embeddings)
                 logger.info(f"✅ RAG: Successfully created new vector store")
             
@@ -301,16 +305,13 @@ Answer:"""
                     
                 file_extension = os.path.splitext(filename)[1].lower()
                 
+                filetype = SUPPORTED_FILETYPES.get(file_extension)
+                if not filetype:
+                    logger.info(f"Skipping unsupported file type: {filename}")
+                    continue
+
                 try:
-                    if file_extension == ".pdf":
-                        _, text_en, sum_en, sum_ar = self.processor.process_document(file_path, 'pdf')
-                    elif file_extension == ".txt":
-                        _, text_en, sum_en, sum_ar = self.processor.process_document(file_path, 'txt')
-                    elif file_extension == ".md":
-                        _, text_en, sum_en, sum_ar = self.processor.process_document(file_path, 'md')
-                    else:
-                        logger.info(f"Skipping unsupported file type: {filename}")
-                        continue
+                    _, text_en, sum_en, sum_ar = self.processor.process_document(file_path, filetype)
 
                     if not text_en.strip():
                         logger.warning(f"No text extracted from {filename}")
@@ -346,14 +347,13 @@ Answer:"""
                 filename = os.path.basename(file_path)
                 file_extension = os.path.splitext(filename)[1].lower()
 
+                filetype = SUPPORTED_FILETYPES.get(file_extension)
+                if filetype not in ('txt', 'md'):
+                    logger.info(f"Skipping unsupported additional file type: {filename}")
+                    continue
+
                 try:
-                    if file_extension == ".txt":
-                        _, text_en, sum_en, sum_ar = self.processor.process_document(file_path, 'txt')
-                    elif file_extension == ".md":
-                        _, text_en, sum_en, sum_ar = self.processor.process_document(file_path, 'md')
-                    else:
-                        logger.info(f"Skipping unsupported additional file type: {filename}")
-                        continue
+                    _, text_en, sum_en, sum_ar = self.processor.process_document(file_path, filetype)
 
                     if not text_en.strip():
                         logger.warning(f"No text extracted from additional file {filename}")
@@ -403,14 +403,19 @@ Answer:"""
             return False
 
     def save_weights(self, path=None):
-        """Save model weights to file"""
+        """Save model weights to file
+        
+        Weights are written as safetensors (no pickling, memory-mapped on
+        load); a legacy .pth path is redirected to its .safetensors sibling.
+        """
         if not self.model:
             logger.warning("No model loaded (GPU not available). Skipping weights save.")
             return False
             
         try:
-            weights_path = path or self.weights_path
-            torch.save(self.model.state_dict(), weights_path)
+            weights_path = _safetensors_path(path or self.weights_path)
+            # save_model (unlike save_file) copes with tied/shared tensors
+            save_model(self.model, weights_path)
             logger.info(f"✅ Model weights saved to {weights_path}")
             return True
         except Exception as e:
@@ -418,19 +423,26 @@ Answer:"""
             return False
 
     def load_weights(self, path=None):
-        """Load model weights from file"""
+        """Load model weights from file (safetensors, or a legacy torch .pth)"""
         if not self.model:
             logger.warning("No model loaded (GPU not available). Skipping weights load.")
             return False
             
         try:
             weights_path = path or self.weights_path
-            if os.path.exists(weights_path):
-                self.model.load_state_dict(torch.load(weights_path))
-                logger.info(f"✅ Model weights loaded from {weights_path}")
+            safetensors_path = _safetensors_path(weights_path)
+            legacy_path = os.path.splitext(safetensors_path)[0] + '.pth'
+            if os.path.exists(safetensors_path):
+                load_model(self.model, safetensors_path)
+                logger.info(f"✅ Model weights loaded from {safetensors_path}")
+                return True
+            elif os.path.exists(legacy_path):
+                # Weights saved by earlier versions with torch.save
+                self.model.load_state_dict(torch.load(legacy_path))
+                logger.info(f"✅ Model weights loaded from {legacy_path}")
                 return True
             else:
-                logger.warning(f"Weights file not found: {weights_path}")
+                logger.warning(f"Weights file not found: {safetensors_path}")
                 return False
         except Exception as e:
             logger.error(f"Error loading weights: {str(e)}")
@@ -491,57 +503,28 @@ Answer:"""
 
 # Standalone document ingestion script for GPU processing
 def create_standalone_ingestion_script():
-    """Create a standalone Python script for document ingestion on GPU"""
+    """Create a standalone Python script for document ingestion on GPU
+    
+    The ingestion CLI lives in the repository-root ingest_documents_gpu.py;
+    the generated script is a thin shim that runs it with this backend.
+    """
     script_content = '''#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
 Standalone Document Ingestion Script for GPU Processing
-Run this script on a GPU-enabled machine to process documents and save weights
+Shim around the repository-root ingest_documents_gpu.py (hallucination backend)
 """
 
 import os
 import sys
-import argparse
-from app_lib.hallucination_fixed_rag import HallucinationFixedRAG
-
-def main():
-    parser = argparse.ArgumentParser(description='Ingest documents for Oman Central Bank RAG system')
-    parser.add_argument('--upload_folder', required=True, help='Path to upload folder containing documents')
-    parser.add_argument('--weights_path', help='Path to save model weights (optional)')
-    parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
-    
-    args = parser.parse_args()
-    
-    if args.verbose:
-        import logging
-        logging.basicConfig(level=logging.INFO)
-    
-    if not os.path.exists(args.upload_folder):
-        print(f"Error: Upload folder {args.upload_folder} does not exist")
-        sys.exit(1)
-    
-    print("Initializing Hallucination Fixed RAG system...")
-    rag = HallucinationFixedRAG(args.upload_folder)
-    
-    print("Ingesting documents...")
-    success = rag.ingest_documents(args.upload_folder)
-    
-    if success:
-        print("✅ Document ingestion completed successfully")
-        
-        # Save weights if specified
-        if args.weights_path:
-            rag.save_weights(args.weights_path)
-        else:
-            rag.save_weights()
-            
-        print("✅ Model weights saved")
-        print(f"📊 Stats: {rag.get_stats()}")
-    else:
-        print("❌ Document ingestion failed")
-        sys.exit(1)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingest_documents_gpu import main
 
 if __name__ == "__main__":
+    if '--backend' not in sys.argv:
+        sys.argv += ['--backend', 'hallucination']
     main()
 '''
     
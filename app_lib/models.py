@@ -4,7 +4,7 @@ SQLAlchemy models for the Document Analyzer application
 
 from datetime import datetime, timedelta
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import Index, Text
+from sqlalchemy import Index, Text, text
 import uuid
 
 db = SQLAlchemy()
@@ -116,6 +116,26 @@ class ChatMessage(db.Model):
             'attached_file': self.attached_file
         }
 
+# PostgreSQL full-text search indexes created alongside the tables
+FULLTEXT_INDEX_STATEMENTS = [
+    # GIN index for full-text search on document content
+    """
+    CREATE INDEX IF NOT EXISTS idx_documents_content_gin 
+    ON documents USING gin(to_tsvector('english', content))
+    """,
+    # GIN index for full-text search on document filename
+    """
+    CREATE INDEX IF NOT EXISTS idx_documents_filename_gin 
+    ON documents USING gin(to_tsvector('english', filename))
+    """,
+]
+
+def create_fulltext_indexes(engine):
+    """Run FULLTEXT_INDEX_STATEMENTS on the given engine in one transaction"""
+    with engine.begin() as conn:
+        for statement in FULLTEXT_INDEX_STATEMENTS:
+            conn.execute(text(statement))
+
 def init_database(app):
     """Initialize database with Flask app"""
     db.init_app(app)
@@ -126,17 +146,7 @@ def init_database(app):
         
         # Create full-text search indexes for PostgreSQL
         try:
-            # Create GIN index for full-text search on document content
-            db.engine.execute("""
-                CREATE INDEX IF NOT EXISTS idx_documents_content_gin 
-                ON documents USING gin(to_tsvector('english', content))
-            """)
-            
-            # Create GIN index for full-text search on document filename
-            db.engine.execute("""
-                CREATE INDEX IF NOT EXISTS idx_documents_filename_gin 
-                ON documents USING gin(to_tsvector('english', filename))
-            """)
+            create_fulltext_indexes(db.engine)
             
             print("✓ Database tables and indexes created successfully")
         except Exception as e:
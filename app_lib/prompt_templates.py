@@ -4,6 +4,7 @@ Prompt Templates for Document Analysis and Chat Responses
 """
 
 import logging
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
@@ -112,10 +113,14 @@ def is_financial_document_type(document_type: str) -> bool:
     """Check if the provided document type is a financial document type"""
     return document_type in FINANCIAL_DOCUMENT_TYPES
 
+@lru_cache(maxsize=4096)
 def match_document_type(user_input: str) -> Optional[str]:
     """
     Match user input to one of the 20 financial document types
     Uses fuzzy matching to handle variations in naming
+    
+    Results are memoized: the mapping is static and the set of distinct
+    inputs users type is small.
     """
     if not user_input or not user_input.strip():
         return None
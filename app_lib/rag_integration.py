@@ -6,6 +6,8 @@ Adapted from rag_module_py.py for Flask integration
 
 import os
 import logging
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
 from langchain_core.documents import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -20,9 +22,25 @@ import pytesseract
 import pdfplumber
 from PIL import Image
 from deep_translator import GoogleTranslator
+from app_lib.extract import preprocess_image_for_ocr, TESSERACT_CONFIG
+from app_lib.faiss_index import read_index
 
 logger = logging.getLogger(__name__)
 
+# Hugging Face hub models used by this backend
+EMBEDDING_MODEL_NAME = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+LLM_MODEL_NAME = "tiiuae/Falcon3-1B-Base"
+
+# Upper bound on files processed concurrently during folder ingestion
+INGEST_MAX_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+# Sentence-transformer encode batch sizes; the GPU needs larger batches to stay busy
+EMBED_BATCH_SIZE_CPU = 32
+EMBED_BATCH_SIZE_GPU = 256
+
+# Chunks collected from parsed files before they are embedded into the index
+EMBED_FLUSH_SIZE = 512
+
 class DocumentProcessor:
     """Document processing for RAG system"""
     
@@ -42,10 +60,8 @@ class DocumentProcessor:
             pdfminer_logger.setLevel(logging.ERROR)
             
             with pdfplumber.open(filepath) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+                page_texts = (page.extract_text() for page in pdf.pages)
+                text = "".join(page_text + "\n" for page_text in page_texts if page_text)
             
             # Restore original logging level
             pdfminer_logger.setLevel(original_level)
@@ -56,7 +72,8 @@ class DocumentProcessor:
     def extract_text_from_image(self, filepath: str) -> str:
         """Extract text from image using OCR"""
         try:
-            return pytesseract.image_to_string(Image.open(filepath), lang=self.ocr_lang)
+            image = preprocess_image_for_ocr(Image.open(filepath))
+            return pytesseract.image_to_string(image, lang=self.ocr_lang, config=TESSERACT_CONFIG)
         except Exception as e:
             logger.error(f"Error extracting text from image {filepath}: {str(e)}")
             return ""
@@ -67,16 +84,15 @@ class DocumentProcessor:
             return text
             
         try:
-            translated_text = ""
+            translated_chunks = []
             translator = self.translator_en if dest == 'en' else self.translator_ar
             
             for i in range(0, len(text), chunk_size):
                 chunk = text[i:i+chunk_size]
                 if chunk.strip():
-                    translated_chunk = translator.translate(chunk)
-                    translated_text += translated_chunk
+                    translated_chunks.append(translator.translate(chunk))
                     
-            return translated_text
+            return "".join(translated_chunks)
         except Exception as e:
             logger.error(f"Translation error: {str(e)}")
             return text  # Return original text if translation fails
@@ -86,6 +102,9 @@ class DocumentProcessor:
         try:
             if filetype == 'pdf':
                 text = self.extract_text_from_pdf(filepath)
+            elif filetype == 'text':
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    text = f.read()
             else:
                 text = self.extract_text_from_image(filepath)
 
@@ -127,7 +146,7 @@ class DepartmentTagger:
 def get_llm():
     """Initialize and return the language model"""
     try:
-        model_name = "tiiuae/Falcon3-1B-Base"
+        model_name = LLM_MODEL_NAME
         logger.info(f"Initializing LLM model: {model_name}")
         
         # Check if transformers and torch are available
@@ -196,9 +215,16 @@ class OmanCBRAG:
             import os
             device = os.environ.get('WHISPER_DEVICE', 'cpu')
             
+            on_gpu = device.startswith('cuda')
+            model_kwargs = {'device': device}
+            if on_gpu:
+                # Half-precision weights halve VRAM, leaving room for the larger batch
+                model_kwargs['model_kwargs'] = {'torch_dtype': torch.float16}
+            
             self.embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
-                model_kwargs={'device': device}
+                model_name=EMBEDDING_MODEL_NAME,
+                model_kwargs=model_kwargs,
+                encode_kwargs={'batch_size': EMBED_BATCH_SIZE_GPU if on_gpu else EMBED_BATCH_SIZE_CPU}
             )
             logger.info(f"Embeddings initialized successfully on {device}")
             
@@ -227,60 +253,206 @@ class OmanCBRAG:
                 logger.error(f"Folder path does not exist: {folder_path}")
                 return False
                 
-            documents = []
+            files = [
+                file for file in os.listdir(folder_path)
+                if file.lower().endswith(('.pdf', '.png', '.jpg', '.jpeg', '.tiff'))
+            ]
             
-            for file in os.listdir(folder_path):
-                if file.lower().endswith(('.pdf', '.png', '.jpg', '.jpeg', '.tiff')):
-                    file_path = os.path.join(folder_path, file)
-                    file_type = 'pdf' if file.lower().endswith('.pdf') else 'image'
-                    
-                    text_orig, text_en, sum_en, sum_ar = self.processor.process_document(file_path, file_type)
-                    
-                    if not text_en or not text_en.strip():
-                        logger.warning(f"No text extracted from {file}")
-                        continue
-                    
-                    depts = self.tagger.tag(text_en)
-                    splitter = RecursiveCharacterTextSplitter(chunk_size=800, chunk_overlap=100)
-                    chunks = splitter.split_text(text_en)
-                    
-                    for chunk in chunks:
-                        if chunk.strip():
-                            doc = Document(
-                                page_content=chunk,
-                                metadata={
-                                    "filename": file,
-                                    "summary_en": sum_en,
-                                    "summary_ar": sum_ar,
-                                    "departments": depts,
-                                    "file_type": file_type
-                                }
-                            )
-                            documents.append(doc)
-
-            if not documents:
+            # Each file is an independent extract -> OCR -> translate pipeline;
+            # Tesseract runs as a subprocess and translation waits on the network,
+            # so files overlap well on threads. map() keeps the folder order and
+            # yields as files finish, so chunks are embedded in EMBED_FLUSH_SIZE
+            # batches while the remaining files are still being parsed.
+            executor = None
+            if len(files) > 1:
+                executor = ThreadPoolExecutor(max_workers=min(INGEST_MAX_WORKERS, len(files)))
+            
+            try:
+                mapper = executor.map if executor else map
+                total_chunks = self._index_in_batches(
+                    mapper(lambda f: self._documents_for_file(folder_path, f), files)
+                )
+            finally:
+                if executor:
+                    executor.shutdown()
+
+            if not total_chunks:
                 logger.warning(f"No documents processed from folder: {folder_path}")
                 return False
 
-            # Create vector store
+            self._build_qa_chain()
+            
+            self.is_initialized = True
+            logger.info(f"Successfully ingested and indexed {total_chunks} chunks from folder {folder_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error ingesting documents: {str(e)}")
+            return False
+
+    def _index_documents(self, documents: List[Document]):
+        """Embed a batch of documents into the vector store, creating it if needed"""
+        if self.vector_store is None:
             self.vector_store = FAISS.from_documents(documents, self.embeddings)
+        else:
+            self.vector_store.add_documents(documents)
+
+    def _index_in_batches(self, per_file, reset: bool = True) -> int:
+        """
+        Index per-file document lists into the vector store
+        
+        Chunks are embedded every EMBED_FLUSH_SIZE documents, so a lazy
+        per_file iterator keeps producing while earlier batches embed.
+        
+        Args:
+            per_file: Iterable of document lists
+            reset: Start a fresh store instead of appending to the current one
             
-            # Create QA chain
-            retriever = self.vector_store.as_retriever(search_type="similarity", search_kwargs={"k": 3})
-            self.qa_chain = RetrievalQA.from_chain_type(
-                llm=self.llm,
-                chain_type="stuff",
-                retriever=retriever,
-                return_source_documents=True,
-                chain_type_kwargs={"prompt": prompt}
+        Returns:
+            Number of chunks indexed
+        """
+        if reset:
+            self.vector_store = None
+        pending = []
+        total_chunks = 0
+        for file_docs in per_file:
+            pending.extend(file_docs)
+            if len(pending) >= EMBED_FLUSH_SIZE:
+                self._index_documents(pending)
+                total_chunks += len(pending)
+                pending = []
+        
+        if pending:
+            self._index_documents(pending)
+            total_chunks += len(pending)
+        return total_chunks
+
+    def _build_qa_chain(self):
+        """Create the retrieval QA chain over the current vector store"""
+        retriever = self.vector_store.as_retriever(search_type="similarity", search_kwargs={"k": 3})
+        self.qa_chain = RetrievalQA.from_chain_type(
+            llm=self.llm,
+            chain_type="stuff",
+            retriever=retriever,
+            return_source_documents=True,
+            chain_type_kwargs={"prompt": prompt}
+        )
+
+    def _documents_for_file(self, folder_path: str, file: str) -> List[Document]:
+        """Extract, translate and chunk one folder file into RAG documents"""
+        file_path = os.path.join(folder_path, file)
+        file_type = 'pdf' if file.lower().endswith('.pdf') else 'image'
+        
+        text_orig, text_en, sum_en, sum_ar = self.processor.process_document(file_path, file_type)
+        return self._chunk_documents(file, file_type, text_en, sum_en, sum_ar)
+
+    def _chunk_documents(self, filename: str, file_type: str, text_en: str,
+                         sum_en: str, sum_ar: str) -> List[Document]:
+        """Tag and chunk extracted English text into RAG documents"""
+        if not text_en or not text_en.strip():
+            logger.warning(f"No text extracted from {filename}")
+            return []
+        
+        depts = self.tagger.tag(text_en)
+        splitter = RecursiveCharacterTextSplitter(chunk_size=800, chunk_overlap=100)
+        chunks = splitter.split_text(text_en)
+        
+        return [
+            Document(
+                page_content=chunk,
+                metadata={
+                    "filename": filename,
+                    "summary_en": sum_en,
+                    "summary_ar": sum_ar,
+                    "departments": depts,
+                    "file_type": file_type
+                }
             )
+            for chunk in chunks if chunk.strip()
+        ]
+
+    def load_vector_store(self, folder_path: str, mmap: bool = False) -> bool:
+        """
+        Load a vector store previously written with save_local
+        
+        Args:
+            folder_path: Folder holding index.faiss and index.pkl
+            mmap: Memory-map the index read-only (query-only use; chunks
+                cannot be added or removed afterwards)
+        """
+        try:
+            if not mmap:
+                self.vector_store = FAISS.load_local(
+                    folder_path, self.embeddings, allow_dangerous_deserialization=True
+                )
+                return True
+            
+            with open(os.path.join(folder_path, "index.pkl"), "rb") as f:
+                docstore, index_to_docstore_id = pickle.load(f)
+            index = read_index(os.path.join(folder_path, "index.faiss"), mmap=True)
+            self.vector_store = FAISS(
+                embedding_function=self.embeddings,
+                index=index,
+                docstore=docstore,
+                index_to_docstore_id=index_to_docstore_id
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error loading vector store from {folder_path}: {str(e)}")
+            return False
+
+    def remove_documents(self, filenames) -> int:
+        """
+        Drop every chunk whose source filename is in filenames
+        
+        Returns:
+            Number of chunks removed
+        """
+        if not self.vector_store:
+            return 0
+        filenames = set(filenames)
+        ids = [
+            doc_id for doc_id, doc in self.vector_store.docstore._dict.items()
+            if doc.metadata.get("filename") in filenames
+        ]
+        if ids:
+            self.vector_store.delete(ids)
+        return len(ids)
+
+    def ingest_parsed_documents(self, parsed: List[Tuple[str, str, str, str, str]],
+                                incremental: bool = False) -> bool:
+        """
+        Index documents that were already extracted by parse_document
+        
+        Args:
+            parsed: (filename, file_type, text_en, summary_en, summary_ar) tuples
+            incremental: Replace these files' chunks in the loaded vector store
+                instead of building a new store
             
+        Returns:
+            True if the vector store holds indexed chunks afterwards
+        """
+        try:
+            if incremental and self.vector_store:
+                self.remove_documents(item[0] for item in parsed)
+            else:
+                incremental = False
+            
+            total_chunks = self._index_in_batches(
+                (self._chunk_documents(*item) for item in parsed), reset=not incremental
+            )
+            
+            if not self.vector_store or not self.vector_store.index.ntotal:
+                logger.warning("No documents produced any text to index")
+                return False
+            
+            self._build_qa_chain()
             self.is_initialized = True
-            logger.info(f"Successfully ingested and indexed {len(documents)} chunks from folder {folder_path}")
+            logger.info(f"Successfully indexed {total_chunks} chunks from {len(parsed)} parsed documents")
             return True
             
         except Exception as e:
-            logger.error(f"Error ingesting documents: {str(e)}")
+            logger.error(f"Error indexing parsed documents: {str(e)}")
             return False
 
     def ingest_single_document(self, file_path: str, filename: str, department: str) -> bool:
@@ -340,11 +512,10 @@ class OmanCBRAG:
             logger.info(f"🔍 RAG: Creating vector embeddings for {len(documents)} documents...")
             # Add to existing vector store or create new one
             if self.vector_store:
-                logger.info(f"🔄 RAG: Merging with existing vector store...")
-                # Add to existing vector store
-                new_vector_store = FAISS.from_documents(documents, self.embeddings)
-                self.vector_store.merge_from(new_vector_store)
-                logger.info(f"✅ RAG: Successfully merged {len(documents)} documents with existing vector store")
+                logger.info(f"🔄 RAG: Adding to existing vector store...")
+                # Embed the batch once and append it straight into the existing index
+                self.vector_store.add_documents(documents)
+                logger.info(f"✅ RAG: Successfully added {len(documents)} documents to existing vector store")
             else:
                 logger.info(f"🆕 RAG: Creating new vector store...")
                 # Create new vector store
@@ -430,6 +601,38 @@ class OmanCBRAG:
             logger.error(f"Error getting RAG stats: {str(e)}")
             return {"error": str(e)}
 
+# Per-process DocumentProcessor used by parse_document in worker processes
+_parse_processor = None
+
+def parse_document(file_path: str) -> Tuple[str, str, str, str, str]:
+    """
+    Extract and translate one document file
+    
+    Module-level (and holding its own DocumentProcessor) so it can run in a
+    ProcessPoolExecutor worker; the result feeds OmanCBRAG.ingest_parsed_documents.
+    
+    Args:
+        file_path: Path to a PDF, text/markdown or image file
+        
+    Returns:
+        (filename, file_type, text_en, summary_en, summary_ar)
+    """
+    global _parse_processor
+    if _parse_processor is None:
+        _parse_processor = DocumentProcessor()
+    
+    filename = os.path.basename(file_path)
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.pdf':
+        file_type = 'pdf'
+    elif extension in ('.txt', '.md'):
+        file_type = 'text'
+    else:
+        file_type = 'image'
+    
+    _, text_en, sum_en, sum_ar = _parse_processor.process_document(file_path, file_type)
+    return filename, file_type, text_en, sum_en, sum_ar
+
 # Global RAG instance
 rag_system = None
 
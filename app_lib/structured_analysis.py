@@ -4,8 +4,32 @@ from typing import List, Dict, Optional
 from app_lib.gemini import query_gemini
 from app_lib.difflib_responses import get_difflib_response
 
+# Prefer RE2 (linear-time DFA matching) for the financial field patterns,
+# which run over full OCR output; fall back to the standard library engine.
+# The patterns below avoid backreferences and lookarounds so both accept them.
+try:
+    import re2 as _fin_re
+except ImportError:
+    _fin_re = re
+
 logger = logging.getLogger(__name__)
 
+# Financial field patterns used by generate_local_financial_analysis
+AMOUNT_PATTERN = _fin_re.compile(r'(?i)[\$£€¥₹]\s*[\d,]+\.?\d*|\d+\.?\d*\s*[\$£€¥₹]|amount[:\s]*[\d,]+\.?\d*')
+DATE_PATTERN = _fin_re.compile(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2}')
+ACCOUNT_PATTERN = _fin_re.compile(r'(?i)account[:\s]*[\d\w-]+|acct[:\s]*[\d\w-]+')
+REFERENCE_PATTERN = _fin_re.compile(r'(?i)ref[:\s]*[\d\w-]+|reference[:\s]*[\d\w-]+|id[:\s]*[\d\w-]+')
+LOAN_AMOUNT_PATTERN = _fin_re.compile(r'(?i)loan amount[:\s]*[\$£€¥₹]?\s*([\d,]+\.?\d*)')
+INTEREST_RATE_PATTERN = _fin_re.compile(r'(?i)interest rate[:\s]*([\d.]+)%?')
+LOAN_TERM_PATTERN = _fin_re.compile(r'(?i)loan term[:\s]*(\d+)\s*(?:years?|months?)')
+MONTHLY_PAYMENT_PATTERN = _fin_re.compile(r'(?i)monthly payment[:\s]*[\$£€¥₹]?\s*([\d,]+\.?\d*)')
+START_DATE_PATTERN = _fin_re.compile(r'(?i)start date[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})')
+MATURITY_DATE_PATTERN = _fin_re.compile(r'(?i)maturity date[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})')
+BORROWER_NAME_PATTERN = _fin_re.compile(r'(?i)borrower name[:\s]*([^\n\r]+)')
+LOAN_NUMBER_PATTERN = _fin_re.compile(r'(?i)loan number[:\s]*([^\n\r]+)')
+PHONE_PATTERN = _fin_re.compile(r'(?i)phone[:\s]*([\(\)\d\s\-\+\.]{10,20})')
+ACCOUNT_NUMBER_PATTERN = _fin_re.compile(r'(?i)account[:\s]*(\d{10,20})')
+
 def analyze_document_structure(text: str) -> Dict[str, List[str]]:
     """
     Analyze document structure and identify logical sections
@@ -377,29 +401,24 @@ def generate_local_financial_analysis(text: str, department: str, language: str
         Local financial document analysis
     """
     # Extract common financial patterns
-    amount_pattern = r'[\$£€¥₹]\s*[\d,]+\.?\d*|\d+\.?\d*\s*[\$£€¥₹]|amount[:\s]*[\d,]+\.?\d*'
-    date_pattern = r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2}'
-    account_pattern = r'account[:\s]*[\d\w-]+|acct[:\s]*[\d\w-]+'
-    reference_pattern = r'ref[:\s]*[\d\w-]+|reference[:\s]*[\d\w-]+|id[:\s]*[\d\w-]+'
-    
-    amounts = re.findall(amount_pattern, text, re.IGNORECASE)
-    dates = re.findall(date_pattern, text)
-    accounts = re.findall(account_pattern, text, re.IGNORECASE)
-    references = re.findall(reference_pattern, text, re.IGNORECASE)
+    amounts = AMOUNT_PATTERN.findall(text)
+    dates = DATE_PATTERN.findall(text)
+    accounts = ACCOUNT_PATTERN.findall(text)
+    references = REFERENCE_PATTERN.findall(text)
     
     # Extract specific loan information
-    loan_amount_match = re.search(r'loan amount[:\s]*[\$£€¥₹]?\s*([\d,]+\.?\d*)', text, re.IGNORECASE)
-    interest_rate_match = re.search(r'interest rate[:\s]*([\d.]+)%?', text, re.IGNORECASE)
-    loan_term_match = re.search(r'loan term[:\s]*(\d+)\s*(?:years?|months?)', text, re.IGNORECASE)
-    monthly_payment_match = re.search(r'monthly payment[:\s]*[\$£€¥₹]?\s*([\d,]+\.?\d*)', text, re.IGNORECASE)
-    start_date_match = re.search(r'start date[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', text, re.IGNORECASE)
-    maturity_date_match = re.search(r'maturity date[:\s]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', text, re.IGNORECASE)
-    borrower_name_match = re.search(r'borrower name[:\s]*([^\n\r]+)', text, re.IGNORECASE)
-    loan_number_match = re.search(r'loan number[:\s]*([^\n\r]+)', text, re.IGNORECASE)
+    loan_amount_match = LOAN_AMOUNT_PATTERN.search(text)
+    interest_rate_match = INTEREST_RATE_PATTERN.search(text)
+    loan_term_match = LOAN_TERM_PATTERN.search(text)
+    monthly_payment_match = MONTHLY_PAYMENT_PATTERN.search(text)
+    start_date_match = START_DATE_PATTERN.search(text)
+    maturity_date_match = MATURITY_DATE_PATTERN.search(text)
+    borrower_name_match = BORROWER_NAME_PATTERN.search(text)
+    loan_number_match = LOAN_NUMBER_PATTERN.search(text)
     
     # Extract phone numbers and account numbers
-    phone_match = re.search(r'phone[:\s]*([\(\)\d\s\-\+\.]{10,20})', text, re.IGNORECASE)
-    account_match = re.search(r'account[:\s]*(\d{10,20})', text, re.IGNORECASE)
+    phone_match = PHONE_PATTERN.search(text)
+    account_match = ACCOUNT_NUMBER_PATTERN.search(text)
     
     # Detect document type based on keywords (more specific first)
     text_lower = text.lower()
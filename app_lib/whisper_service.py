@@ -16,6 +16,7 @@ from __future__ import annotations
 import os
 import time
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, Optional, Tuple, List
 import shutil
@@ -51,6 +52,9 @@ class WhisperService:
         self.device: str = device or os.environ.get('WHISPER_DEVICE', 'cpu')
         self.model_name: str = model_name or os.environ.get('WHISPER_MODEL', 'base')
         self._model = None  # lazy-loaded whisper model
+        self._model_lock = threading.Lock()
+        # Set once the model is loaded and has run a first inference
+        self._ready = threading.Event()
         self._banking_knowledge: str = ""
 
         # Concise console summary
@@ -83,17 +87,50 @@ class WhisperService:
     def _lazy_load_model(self) -> None:
         if self._model is not None:
             return
-        t0 = time.perf_counter()
+        # A request may arrive while the warmup thread is still loading
+        with self._model_lock:
+            if self._model is not None:
+                return
+            t0 = time.perf_counter()
+            try:
+                import whisper  # type: ignore
+            except Exception as e:
+                logger.error(f"Whisper not installed: {e}")
+                raise
+
+            from app_lib.whisper_weights import load_whisper_model
+
+            logger.debug(f"Loading Whisper model '{self.model_name}' on device '{self.device}'...")
+            # On CPU this builds on the checkpoint the gunicorn master loaded,
+            # so workers share one copy of the weights
+            self._model = load_whisper_model(self.model_name, self.device)
+            elapsed = time.perf_counter() - t0
+            logger.info(f"Whisper model loaded in {elapsed:.2f}s")
+
+    def _warmup(self) -> None:
+        """Load the model and run one second of silence through it"""
         try:
-            import whisper  # type: ignore
-        except Exception as e:
-            logger.error(f"Whisper not installed: {e}")
-            raise
+            import numpy as np  # type: ignore
 
-        logger.debug(f"Loading Whisper model '{self.model_name}' on device '{self.device}'...")
-        self._model = whisper.load_model(self.model_name, device=self.device)
-        elapsed = time.perf_counter() - t0
-        logger.info(f"Whisper model loaded in {elapsed:.2f}s")
+            t0 = time.perf_counter()
+            self._lazy_load_model()
+            # First inference pays for kernel selection and mel filter setup
+            self._model.transcribe(np.zeros(16000, dtype=np.float32), fp16=self.device == 'cuda')
+            logger.info(f"Whisper warmed up in {time.perf_counter() - t0:.2f}s")
+        except Exception as e:
+            logger.warning(f"Whisper warmup failed: {e}")
+        finally:
+            self._ready.set()
+
+    def start_warmup(self) -> threading.Thread:
+        """Warm the model on a daemon thread so startup does not wait for it"""
+        thread = threading.Thread(target=self._warmup, name='whisper-warmup', daemon=True)
+        thread.start()
+        return thread
+
+    def is_ready(self) -> bool:
+        """Whether warmup has finished (successfully or not)"""
+        return self._ready.is_set()
 
     # ------- Public API -------
 
@@ -0,0 +1,122 @@
+"""
+Whisper checkpoints shared between forked gunicorn workers
+
+The gunicorn master loads the checkpoint once and converts it to fp32 (see
+gunicorn.conf.py); workers forked afterwards build their CPU models on top
+of those tensors, so N workers share one copy-on-write copy of the weights
+instead of each holding a private one.
+
+Locating the checkpoint file and the alignment heads relies on
+openai-whisper internals (whisper._MODELS, whisper._ALIGNMENT_HEADS), which
+is why requirements.txt pins the openai-whisper release they were checked
+against. If they are missing, preload is skipped and every worker falls back
+to whisper.load_model.
+"""
+
+import logging
+import os
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# fp32 checkpoints loaded by preload_whisper_weights(), keyed by model name
+_PRELOADED_CHECKPOINTS: Dict[str, Any] = {}
+
+
+def _checkpoint_path(model_name: str) -> Optional[str]:
+    """Path of an already-downloaded checkpoint for a model name or file path"""
+    import whisper
+
+    if os.path.isfile(model_name):
+        return model_name
+    models = getattr(whisper, '_MODELS', None)
+    if not models or model_name not in models:
+        return None
+    download_root = os.path.join(
+        os.getenv('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'whisper'
+    )
+    path = os.path.join(download_root, os.path.basename(models[model_name]))
+    return path if os.path.isfile(path) else None
+
+
+def preload_whisper_weights(model_name: Optional[str] = None) -> bool:
+    """
+    Load a Whisper checkpoint as fp32 in the parent process before workers fork
+
+    The .pt files store fp16 weights. Converting them here, once, means the
+    workers neither convert their own copy nor run CPU inference on fp16
+    parameters (whisper's LayerNorm only casts its input to fp32).
+
+    Never downloads: the gunicorn master must not block on the network, so a
+    checkpoint that is not in the whisper cache yet is left to the workers'
+    own whisper.load_model.
+
+    Args:
+        model_name: Whisper model name or checkpoint path (default: WHISPER_MODEL)
+
+    Returns:
+        True if the checkpoint was loaded
+    """
+    from importlib.util import find_spec
+
+    model_name = model_name or os.environ.get('WHISPER_MODEL', 'base')
+    if find_spec('whisper') is None:
+        return False
+    if os.environ.get('WHISPER_DEVICE', 'cpu') != 'cpu':
+        # GPU workers copy the weights to the device anyway
+        return False
+
+    try:
+        import torch
+
+        checkpoint_path = _checkpoint_path(model_name)
+        if checkpoint_path is None:
+            logger.warning(f"Whisper checkpoint '{model_name}' is not downloaded yet; skipping preload")
+            return False
+
+        # mmap so the fp16 file is only read page by page while converting
+        checkpoint = torch.load(checkpoint_path, map_location='cpu', mmap=True, weights_only=True)
+        _PRELOADED_CHECKPOINTS[model_name] = {
+            'dims': checkpoint['dims'],
+            'model_state_dict': {
+                key: tensor.float() for key, tensor in checkpoint['model_state_dict'].items()
+            },
+        }
+        logger.info(f"Preloaded Whisper checkpoint '{model_name}' from {checkpoint_path}")
+        return True
+    except Exception as e:
+        logger.warning(f"Could not preload Whisper weights, workers will load their own: {e}")
+        return False
+
+
+def model_from_checkpoint(model_name: str, checkpoint: Dict[str, Any]):
+    """Build a CPU Whisper model whose parameters alias the preloaded fp32 tensors"""
+    import whisper
+    from whisper.model import ModelDimensions, Whisper
+
+    model = Whisper(ModelDimensions(**checkpoint['dims']))
+    # assign=True keeps the tensors inherited from the master instead of
+    # copying them, so forked workers share their pages
+    model.load_state_dict(checkpoint['model_state_dict'], assign=True)
+    alignment_heads = getattr(whisper, '_ALIGNMENT_HEADS', {})
+    if model_name in alignment_heads:
+        model.set_alignment_heads(alignment_heads[model_name])
+    return model
+
+
+def load_whisper_model(model_name: str, device: str):
+    """
+    whisper.load_model, reusing the preloaded checkpoint on CPU
+
+    Args:
+        model_name: Whisper model name or checkpoint path
+        device: 'cpu' or 'cuda'
+
+    Returns:
+        whisper.model.Whisper
+    """
+    if device == 'cpu' and model_name in _PRELOADED_CHECKPOINTS:
+        return model_from_checkpoint(model_name, _PRELOADED_CHECKPOINTS[model_name])
+
+    import whisper
+    return whisper.load_model(model_name, device=device)
@@ -0,0 +1,16 @@
+"""
+Gunicorn settings for the Flask backend
+
+gunicorn picks this file up automatically when started from the project
+root, e.g. `gunicorn -w 4 -b 0.0.0.0:5000 app:app`.
+"""
+
+
+def on_starting(server):
+    """Load the Whisper weights once in the master so forked workers share them
+    
+    Only an already-downloaded checkpoint is loaded; the master never waits
+    on a model download.
+    """
+    from app_lib.whisper_weights import preload_whisper_weights
+    preload_whisper_weights()
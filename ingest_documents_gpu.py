@@ -17,30 +17,241 @@ Usage:
 import os
 import sys
 import argparse
+import hashlib
+import json
 import logging
+import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+MANIFEST_NAME = '.ingest_manifest.json'
+
+# Only the head of each file is hashed; size and mtime cover the rest
+HASH_PREFIX_BYTES = 1 << 20
+
 def check_gpu_availability():
     """Check if GPU is available for processing"""
+    from app_lib.device import get_cuda_info
+    
+    info = get_cuda_info()
+    if info['available']:
+        print(f"✅ GPU detected: {info['name']} (Count: {info['count']})")
+        return True
+    else:
+        print("⚠️ No GPU detected. RAG model will use CPU.")
+        print("   Document processing will still work, but may be slower.")
+        return False
+
+def compile_embedder(embeddings):
+    """Wrap the sentence-transformer's HF model in torch.compile
+    
+    Returns True if the model was compiled. Compilation is skipped on CPU and
+    on PyTorch builds without torch.compile.
+    """
     try:
         import torch
-        if torch.cuda.is_available():
-            gpu_count = torch.cuda.device_count()
-            gpu_name = torch.cuda.get_device_name(0)
-            print(f"✅ GPU detected: {gpu_name} (Count: {gpu_count})")
-            return True
-        else:
-            print("⚠️ No GPU detected. RAG model will use CPU.")
-            print("   Document processing will still work, but may be slower.")
+        if not torch.cuda.is_available() or not hasattr(torch, 'compile'):
+            print("⚠️ torch.compile needs PyTorch 2.x and a GPU - using eager mode")
             return False
-    except ImportError:
-        print("❌ PyTorch not installed. Please install torch first.")
+        
+        # langchain_huggingface keeps the SentenceTransformer in _client;
+        # module 0 is the Transformer wrapper holding the HF model
+        transformer = embeddings._client[0]
+        transformer.auto_model = torch.compile(transformer.auto_model, mode="reduce-overhead")
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not compile embedding model: {str(e)}")
         return False
 
+def _prefix_hash(path):
+    """Hash the first HASH_PREFIX_BYTES of a file (blake3 when installed)"""
+    with open(path, 'rb') as f:
+        head = f.read(HASH_PREFIX_BYTES)
+    if BLAKE3_AVAILABLE:
+        return blake3.blake3(head).hexdigest()[:16]
+    return hashlib.blake2b(head, digest_size=8).hexdigest()
+
+def load_manifest(upload_folder):
+    """Read the previous successful ingest's manifest
+    
+    Returns:
+        ({filename: [mtime_ns, size, hash]}, index kind of the saved store).
+        The kind is None when there is no manifest or it predates the
+        index_kind field, in which case the saved layout is unknown.
+    """
+    try:
+        with open(upload_folder / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}, None
+    if not isinstance(manifest, dict):
+        return {}, None
+    if isinstance(manifest.get('files'), dict):
+        return manifest['files'], manifest.get('index_kind')
+    # Older manifests were the bare {filename: fingerprint} mapping
+    return manifest, None
+
+def fingerprint_documents(documents, manifest):
+    """Fingerprint documents, hashing only files whose size/mtime changed"""
+    fingerprints = {}
+    for path in documents:
+        st = path.stat()
+        previous = manifest.get(path.name)
+        if previous and previous[0] == st.st_mtime_ns and previous[1] == st.st_size:
+            fingerprints[path.name] = previous
+        else:
+            fingerprints[path.name] = [st.st_mtime_ns, st.st_size, _prefix_hash(path)]
+    return fingerprints
+
+def write_manifest(upload_folder, fingerprints, index_kind):
+    """Atomically replace the manifest so an interrupted run never leaves half a file"""
+    fd, tmp_path = tempfile.mkstemp(dir=upload_folder, prefix=MANIFEST_NAME, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'index_kind': index_kind, 'files': fingerprints}, f)
+        os.replace(tmp_path, upload_folder / MANIFEST_NAME)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _pin_parse_worker(cores):
+    """ProcessPoolExecutor initializer: pin this worker to one core
+    
+    Keeps each parse worker on a single core (and so a single NUMA node)
+    instead of migrating between sockets, and stops BLAS/OpenMP inside the
+    worker from spawning threads that would fight over that core.
+    """
+    os.environ['OMP_NUM_THREADS'] = '1'
+    if 'torch' in sys.modules:
+        sys.modules['torch'].set_num_threads(1)
+    
+    if not cores or not hasattr(os, 'sched_setaffinity'):
+        return
+    import multiprocessing
+    identity = multiprocessing.current_process()._identity
+    worker_index = identity[0] - 1 if identity else 0
+    try:
+        os.sched_setaffinity(0, {cores[worker_index % len(cores)]})
+    except OSError:
+        pass
+
+def parse_documents(documents):
+    """Parse documents in worker processes, largest first
+    
+    Largest files go first (LPT scheduling) so a big PDF does not start last
+    and stretch the parse phase.
+    """
+    from app_lib.rag_integration import parse_document
+    
+    documents = sorted(documents, key=lambda p: p.stat().st_size, reverse=True)
+    if not documents:
+        return []
+    # Cores this process may run on (respects taskset/cgroup limits)
+    cores = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else []
+    workers = min(len(cores) or os.cpu_count() or 1, len(documents))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_pin_parse_worker,
+                             initargs=(cores,)) as executor:
+        return list(executor.map(parse_document, [str(p) for p in documents]))
+
+def ingest_integration(upload_folder, documents, args, changed=None, removed=()):
+    """Parse documents in worker processes, then index them with OmanCBRAG
+    
+    With changed set, the saved vector store is loaded and only those
+    documents are re-indexed; chunks of removed files are dropped. If the
+    saved store cannot be loaded, every document is parsed and indexed into
+    a new store instead, so unchanged files are never lost from the index.
+    """
+    from app_lib.rag_integration import initialize_rag_system
+    
+    # Parse before the embedding/LLM models load so the worker processes
+    # fork from a small parent
+    print("📚 Parsing documents...")
+    incremental = changed is not None
+    parsed = parse_documents(changed if incremental else documents)
+    
+    # Initialize RAG system without a folder: documents are already parsed
+    rag = initialize_rag_system()
+    if not rag:
+        return None, False
+    
+    if incremental:
+        if rag.load_vector_store(str(upload_folder)):
+            if removed:
+                rag.remove_documents(removed)
+        else:
+            print("⚠️ Could not load the saved vector store - re-indexing all documents")
+            incremental = False
+            pending = set(changed)
+            parsed += parse_documents([doc for doc in documents if doc not in pending])
+    
+    if args.compile and rag.embeddings and compile_embedder(rag.embeddings):
+        print("⚡ Embedding model compiled with torch.compile")
+    
+    print("📚 Indexing documents...")
+    return rag, rag.ingest_parsed_documents(parsed, incremental=incremental)
+
+def ingest_hallucination(upload_folder, documents, args, changed=None, removed=()):
+    """Ingest the folder with HallucinationFixedRAG and save its model weights
+    
+    This backend always rebuilds from the whole folder.
+    """
+    from app_lib.hallucination_fixed_rag import HallucinationFixedRAG
+    
+    rag = HallucinationFixedRAG(str(upload_folder))
+    
+    if args.compile and compile_embedder(rag.embeddings):
+        print("⚡ Embedding model compiled with torch.compile")
+    
+    print("📚 Ingesting documents...")
+    success = rag.ingest_documents(str(upload_folder))
+    if success:
+        rag.save_weights(args.weights_path)
+    return rag, success
+
+def prefetch_models(backend):
+    """Download the backend's hub models up front, in parallel
+    
+    Each snapshot is fetched with several download workers, and the
+    embedding model and LLM download at the same time, so the ingest run
+    starts against a warm Hugging Face cache instead of pulling each model
+    serially when it is first used.
+    """
+    from importlib.util import find_spec
+    
+    # Must be set before huggingface_hub is imported; only valid with the
+    # optional Rust hf_transfer package installed
+    if find_spec('hf_transfer') is not None:
+        os.environ.setdefault('HF_HUB_ENABLE_HF_TRANSFER', '1')
+    
+    from concurrent.futures import ThreadPoolExecutor
+    from huggingface_hub import snapshot_download
+    
+    if backend == 'hallucination':
+        from app_lib.hallucination_fixed_rag import EMBEDDING_MODEL_NAME, LLM_MODEL_NAME
+    else:
+        from app_lib.rag_integration import EMBEDDING_MODEL_NAME, LLM_MODEL_NAME
+    
+    repos = [EMBEDDING_MODEL_NAME, LLM_MODEL_NAME]
+    with ThreadPoolExecutor(max_workers=len(repos)) as executor:
+        list(executor.map(lambda repo: snapshot_download(repo, max_workers=8), repos))
+    return repos
+
+BACKENDS = {
+    'integration': ingest_integration,
+    'hallucination': ingest_hallucination,
+}
+
 def main():
     parser = argparse.ArgumentParser(
         description='Ingest documents for Oman Central Bank RAG Integration system',
@@ -56,8 +267,17 @@ Examples:
   # Force re-processing
   python ingest_documents_gpu.py --upload_folder ./uploads --force
 
+  # Compressed IVF-PQ index for large document sets
+  python ingest_documents_gpu.py --upload_folder ./uploads --index ivfpq
+
+  # GPU-built CAGRA graph index (faiss with cuVS)
+  python ingest_documents_gpu.py --upload_folder ./uploads --use_cuvs
+
   # Process specific folder
   python ingest_documents_gpu.py --upload_folder /path/to/documents --verbose
+
+  # Ingest into the Falcon-based hallucination-fixed RAG instead
+  python ingest_documents_gpu.py --upload_folder ./uploads --backend hallucination
         """
     )
     
@@ -67,6 +287,18 @@ Examples:
                        help='Enable verbose logging')
     parser.add_argument('--force', '-f', action='store_true',
                        help='Force re-processing even if vector store exists')
+    parser.add_argument('--index', choices=['flat', 'fp16', 'ivfpq'], default='flat',
+                       help='FAISS index layout: exact flat (default), half-size FP16, or compressed IVF-PQ for large corpora')
+    parser.add_argument('--use_cuvs', action='store_true',
+                       help='Build a CAGRA graph index with the cuVS GPU backend (requires faiss with cuVS)')
+    parser.add_argument('--compile', action='store_true',
+                       help='Compile the embedding model with torch.compile on GPU (PyTorch 2.x)')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='integration',
+                       help='RAG implementation to ingest into (default: integration)')
+    parser.add_argument('--prefetch-models', action='store_true',
+                       help='Download the backend models from the Hugging Face hub before ingesting')
+    parser.add_argument('--weights_path',
+                       help='Where the hallucination backend saves model weights (default: in the upload folder)')
     
     args = parser.parse_args()
     
@@ -96,9 +328,19 @@ Examples:
     
     # Check for documents
     supported_extensions = {'.pdf', '.txt', '.md'}
+    # One directory pass finds both the documents (extensions compared
+    # case-insensitively) and any vector store files from a previous run
     documents = []
-    for ext in supported_extensions:
-        documents.extend(upload_folder.glob(f'*{ext}'))
+    vector_store_files = []
+    with os.scandir(upload_folder) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            ext = os.path.splitext(entry.name)[1].lower()
+            if ext in supported_extensions:
+                documents.append(Path(entry.path))
+            elif ext in ('.pkl', '.faiss'):
+                vector_store_files.append(Path(entry.path))
     
     if not documents:
         print(f"❌ No supported documents found in {upload_folder}")
@@ -111,40 +353,64 @@ Examples:
     if len(documents) > 5:
         print(f"   ... and {len(documents) - 5} more")
     
-    # Check if vector store already exists (look for common vector store files)
-    vector_store_files = list(upload_folder.glob("*.pkl")) + list(upload_folder.glob("*.faiss"))
+    # Compare against the manifest of the last successful run so unchanged
+    # documents are not parsed and embedded again
+    manifest, manifest_kind = load_manifest(upload_folder)
+    fingerprints = fingerprint_documents(documents, manifest)
+    index_kind = 'cagra' if args.use_cuvs else args.index
+    
+    # Check if vector store already exists (vector_store_files from the scan above)
+    changed = None
+    removed = []
     if vector_store_files and not args.force:
-        print(f"⚠️ Vector store files already exist: {[f.name for f in vector_store_files]}")
-        print("   Use --force to re-process documents")
-        sys.exit(0)
+        changed = [doc for doc in documents if manifest.get(doc.name) != fingerprints[doc.name]]
+        removed = [name for name in manifest if name not in fingerprints]
+        if not changed and not removed and manifest_kind == index_kind:
+            print(f"✅ Vector store is up to date: {[f.name for f in vector_store_files]}")
+            print("   Use --force to re-process documents")
+            sys.exit(0)
+        
+        print(f"🔁 {len(changed)} changed and {len(removed)} removed documents since last ingest")
+        # Only the exact flat layout supports in-place removal and append,
+        # and the saved store must have been written in that layout too
+        if not (args.backend == 'integration' and index_kind == 'flat' and manifest_kind == 'flat'):
+            print(f"   Saved index layout: {manifest_kind or 'unknown'} - rebuilding the whole vector store")
+            changed = None
+            removed = []
     
     try:
-        # Import and initialize RAG system
-        print("\n🔧 Initializing RAG Integration system...")
-        from app_lib.rag_integration import initialize_rag_system
-        
         start_time = time.time()
-        rag = initialize_rag_system(str(upload_folder))
+        
+        if args.prefetch_models:
+            print("\n⬇️ Prefetching models...")
+            for repo in prefetch_models(args.backend):
+                print(f"   - {repo}")
+        
+        print(f"\n🔧 Initializing {args.backend} RAG backend...")
+        rag, success = BACKENDS[args.backend](upload_folder, documents, args,
+                                              changed=changed, removed=removed)
         
         if not rag:
             print("❌ Failed to initialize RAG system")
             sys.exit(1)
         
-        print("📚 Ingesting documents...")
-        success = rag.ingest_documents_from_folder(str(upload_folder))
-        
         if success:
+            if index_kind != 'flat':
+                from app_lib.faiss_index import reindex_vector_store
+                if reindex_vector_store(rag.vector_store, index_kind, use_gpu=gpu_available):
+                    print(f"🗜️ Rebuilt vector index as {index_kind}")
+            
+            rag.vector_store.save_local(str(upload_folder))
+            write_manifest(upload_folder, fingerprints, index_kind)
+            
             ingestion_time = time.time() - start_time
             print(f"✅ Document ingestion completed successfully in {ingestion_time:.2f} seconds")
             
-            # Show stats
+            # Show stats (keys differ between backends)
             stats = rag.get_stats()
             print(f"\n📊 Processing Statistics:")
-            print(f"   - Documents indexed: {stats.get('document_count', 0)}")
-            print(f"   - System initialized: {stats.get('initialized', False)}")
-            print(f"   - Embeddings ready: {stats.get('embeddings_ready', False)}")
-            print(f"   - LLM ready: {stats.get('llm_ready', False)}")
-            print(f"   - QA chain ready: {stats.get('qa_chain_ready', False)}")
+            for key, value in stats.items():
+                print(f"   - {key.replace('_', ' ').capitalize()}: {value}")
             print(f"   - Processing time: {ingestion_time:.2f} seconds")
             
             # Test the system
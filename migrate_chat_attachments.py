@@ -5,40 +5,43 @@ Migration script to add attached_file column to chat_messages table
 
 import os
 import sys
-from sqlalchemy import text
+from sqlalchemy import create_engine, text
 
 # Add current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app_lib.db import get_db
-from app_lib.models import db
+from app_lib.db import POSTGRES_URI
+
+# Existence check and ALTER run server-side in one statement, so the
+# migration is a single idempotent round trip.
+ADD_ATTACHED_FILE_COLUMN = """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1
+            FROM information_schema.columns
+            WHERE table_name = 'chat_messages'
+            AND column_name = 'attached_file'
+        ) THEN
+            ALTER TABLE chat_messages ADD COLUMN attached_file VARCHAR(255);
+        END IF;
+    END $$;
+"""
 
 def migrate_chat_attachments():
     """Add attached_file column to chat_messages table if it doesn't exist"""
+    engine = create_engine(POSTGRES_URI)
     try:
-        # Check if column already exists
-        result = db.engine.execute(text("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'chat_messages' 
-            AND column_name = 'attached_file'
-        """)).fetchone()
-        
-        if result:
-            print("✓ attached_file column already exists in chat_messages table")
-            return
-        
-        # Add the column
-        db.engine.execute(text("""
-            ALTER TABLE chat_messages 
-            ADD COLUMN attached_file VARCHAR(255)
-        """))
+        with engine.begin() as conn:
+            conn.execute(text(ADD_ATTACHED_FILE_COLUMN))
         
-        print("✓ Successfully added attached_file column to chat_messages table")
+        print("✓ attached_file column is present in chat_messages table")
         
     except Exception as e:
         print(f"✗ Error adding attached_file column: {e}")
         raise
+    finally:
+        engine.dispose()
 
 if __name__ == "__main__":
     print("Starting chat attachments migration...")
@@ -14,11 +14,8 @@ def _startup_device_check() -> None:
     - WHISPER_DEVICE: 'cuda' or 'cpu'
     - WHISPER_MODEL: pick a sensible default per device
     """
-    try:
-        import torch  # type: ignore
-        has_cuda = bool(getattr(torch, "cuda", None) and torch.cuda.is_available())
-    except Exception:
-        has_cuda = False
+    from app_lib.device import cuda_available
+    has_cuda = cuda_available()
 
     whisper_device = 'cuda' if has_cuda else 'cpu'
     whisper_model = 'small' if has_cuda else 'base'
@@ -7,12 +7,36 @@ Handles RAG enable/disable choice before starting the app
 import sys
 import os
 
-def _startup_device_check() -> None:
-    try:
+def _tune_cpu_threads() -> None:
+    """Size torch's OpenMP/MKL pools to physical cores for CPU inference"""
+    from app_lib.device import physical_cpu_count
+
+    cores = physical_cpu_count()
+    # Read by OpenMP/MKL when torch is first imported; explicit settings win
+    os.environ.setdefault('OMP_NUM_THREADS', str(cores))
+    os.environ.setdefault('MKL_NUM_THREADS', str(cores))
+
+    if 'torch' in sys.modules:
         import torch  # type: ignore
-        has_cuda = bool(getattr(torch, 'cuda', None) and torch.cuda.is_available())
-    except Exception:
-        has_cuda = False
+        torch.set_num_threads(int(os.environ['OMP_NUM_THREADS']))
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Only settable before the first inter-op parallel work
+            pass
+
+def _startup_device_check() -> None:
+    # Respect a device chosen by the caller instead of probing CUDA again
+    preset_device = os.environ.get('WHISPER_DEVICE')
+    if preset_device in ('cuda', 'cpu'):
+        has_cuda = preset_device == 'cuda'
+    else:
+        # Driver-level probe: no torch import and no CUDA context
+        from app_lib.device import cuda_available
+        has_cuda = cuda_available()
+
+    if not has_cuda:
+        _tune_cpu_threads()
 
     whisper_device = 'cuda' if has_cuda else 'cpu'
     whisper_model = 'small' if has_cuda else 'base'
@@ -40,12 +64,7 @@ def main():
         _startup_device_check()
         
         # If GPU is not available, force-disable RAG and skip interactive prompts
-        gpu_available = False
-        try:
-            import torch  # type: ignore
-            gpu_available = bool(getattr(torch, 'cuda', None) and torch.cuda.is_available())
-        except Exception:
-            gpu_available = False
+        gpu_available = os.environ['WHISPER_DEVICE'] == 'cuda'
         
         if not gpu_available:
             print("\n🖥️  GPU not available - RAG will be disabled (skipping prompts)")
@@ -5,12 +5,21 @@ Alternative libraries and methods to process audio without FFmpeg
 """
 
 import io
-import wave
+import functools
+import math
+import struct
 import numpy as np
 from typing import Optional, Tuple, Dict, Any
 import tempfile
 import os
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from importlib.util import find_spec
+
+from app_lib.whisper_weights import load_whisper_model
 
 logger = logging.getLogger(__name__)
 
@@ -39,7 +48,7 @@ try:
     PYDUB_AVAILABLE = True
     # Check if FFmpeg is available (optional with pydub)
     FFMPEG_AVAILABLE = which("ffmpeg") is not None
-    logger.info(f"pydub available for audio processing, FFmpeg available: {FFMPEG_AVAILABLE}")
+    logger.info("pydub available for audio processing, FFmpeg available: %s", FFMPEG_AVAILABLE)
 except ImportError:
     PYDUB_AVAILABLE = False
     FFMPEG_AVAILABLE = False
@@ -54,49 +63,154 @@ except ImportError:
     SCIPY_AVAILABLE = False
     logger.warning("scipy not available. Install with: pip install scipy")
 
+# Polyphase resampling (used by the soundfile and scipy paths when available)
+try:
+    from scipy.signal import firwin, resample_poly
+    RESAMPLE_POLY_AVAILABLE = True
+except ImportError:
+    RESAMPLE_POLY_AVAILABLE = False
+
+@functools.lru_cache(maxsize=16)
+def _resample_plan(orig_sr: int, target_sr: int) -> Tuple[int, int, np.ndarray]:
+    """
+    Up/down factors and anti-aliasing FIR taps for one sample-rate pair
+    
+    Same filter resample_poly designs on every call with its default
+    ('kaiser', 5.0) window; 44.1kHz -> 16kHz alone is an 8821-tap design.
+    """
+    g = math.gcd(orig_sr, target_sr)
+    up, down = target_sr // g, orig_sr // g
+    max_rate = max(up, down)
+    taps = firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=('kaiser', 5.0))
+    taps.setflags(write=False)
+    return up, down, taps
+
+def _check_available_processors() -> Dict[str, bool]:
+    """Check which audio processing libraries are available"""
+    return {
+        'librosa': LIBROSA_AVAILABLE,
+        'soundfile': SOUNDFILE_AVAILABLE,  
+        'pydub': PYDUB_AVAILABLE,
+        'pydub_with_ffmpeg': PYDUB_AVAILABLE and FFMPEG_AVAILABLE,
+        'scipy': SCIPY_AVAILABLE
+    }
+
+def _compute_best_processor(available: Dict[str, bool]) -> Optional[str]:
+    """Pick the preferred library among the available ones (None if none)"""
+    for name in ('librosa', 'soundfile', 'pydub', 'scipy'):
+        if available[name]:
+            return name
+    return None
+
+# Probed once per process; every AudioProcessor shares the result
+_AVAILABLE_PROCESSORS = _check_available_processors()
+_BEST_PROCESSOR = _compute_best_processor(_AVAILABLE_PROCESSORS)
+
+# Whisper implementation: 'openai' (openai-whisper, default) or 'faster'
+# (faster-whisper / CTranslate2 with int8 CPU and float16 GPU kernels)
+WHISPER_BACKEND = os.environ.get('WHISPER_BACKEND', 'openai').lower()
+FASTER_WHISPER_AVAILABLE = find_spec('faster_whisper') is not None
+
+# Concurrent short clips are decoded together in one batched forward pass of
+# up to WHISPER_BATCH_SIZE mels; 1 (the default) decodes each request alone.
+WHISPER_BATCH_SIZE = int(os.environ.get('WHISPER_BATCH_SIZE', '1'))
+# How long the first request in a batch waits for companions
+WHISPER_BATCH_WAIT_MS = int(os.environ.get('WHISPER_BATCH_WAIT_MS', '20'))
+
+# Decoders worth trying per container, in order; unknown input tries them all
+_FORMAT_PROCESSORS = {
+    'wav': ('soundfile', 'scipy', 'pydub'),
+    'flac': ('soundfile', 'librosa'),
+    'ogg': ('soundfile', 'pydub', 'librosa'),
+    'webm': ('pydub', 'librosa'),
+    'mp4': ('pydub', 'librosa'),
+    'mp3': ('pydub', 'librosa', 'soundfile'),
+}
+_FALLBACK_PROCESSORS = ('soundfile', 'scipy', 'pydub', 'librosa')
+
+def _detect_format(audio_data: bytes) -> Optional[str]:
+    """Identify the audio container from its magic bytes (None if unrecognised)"""
+    head = audio_data[:12]
+    if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+        return 'wav'
+    if head[:4] == b'fLaC':
+        return 'flac'
+    if head[:4] == b'OggS':
+        return 'ogg'
+    if head[:4] == b'\x1aE\xdf\xa3':  # EBML: WebM / Matroska
+        return 'webm'
+    if head[4:8] == b'ftyp':
+        return 'mp4'
+    # ID3 tag, or an MPEG audio frame sync with a non-zero layer (rules out AAC ADTS)
+    if head[:3] == b'ID3' or (len(head) > 1 and head[0] == 0xFF
+                              and head[1] & 0xE0 == 0xE0 and head[1] & 0x06):
+        return 'mp3'
+    return None
+
+_WAV_FMT = struct.Struct('<HHIIHH')
+_WAV_CHUNK = struct.Struct('<4sI')
+
+def _parse_pcm16_wav(audio_data: bytes) -> Optional[Tuple[np.ndarray, int, int]]:
+    """
+    Locate the samples of an uncompressed 16-bit PCM WAV without copying them
+    
+    Walks the RIFF chunks (LIST/fact chunks may sit before 'data', so the
+    samples do not always start at byte 44).
+    
+    Returns:
+        (int16 view of the interleaved samples, channels, sample_rate), or
+        None for anything other than 16-bit integer PCM WAV
+    """
+    if len(audio_data) < 12 or audio_data[:4] != b'RIFF' or audio_data[8:12] != b'WAVE':
+        return None
+    
+    fmt = None
+    offset = 12
+    while offset + _WAV_CHUNK.size <= len(audio_data):
+        chunk_id, chunk_size = _WAV_CHUNK.unpack_from(audio_data, offset)
+        offset += _WAV_CHUNK.size
+        if chunk_id == b'fmt ':
+            if chunk_size < _WAV_FMT.size:
+                return None
+            fmt = _WAV_FMT.unpack_from(audio_data, offset)
+        elif chunk_id == b'data':
+            if fmt is None:
+                return None
+            audio_format, channels, sample_rate, _, _, bits_per_sample = fmt
+            if audio_format != 1 or bits_per_sample != 16 or channels < 1:
+                return None
+            # Streaming writers leave the size at 0 / 0xFFFFFFFF; clamp to what arrived
+            data_size = min(chunk_size, len(audio_data) - offset)
+            frame_bytes = 2 * channels
+            count = (data_size // frame_bytes) * channels
+            samples = np.frombuffer(audio_data, dtype='<i2', count=count, offset=offset)
+            return samples, channels, sample_rate
+        # Chunks are word-aligned
+        offset += chunk_size + (chunk_size & 1)
+    return None
+
+# Canonical 44-byte RIFF/WAVE header: RIFF chunk, 16-byte PCM fmt chunk, data chunk
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
 class AudioProcessor:
     """Audio processing without FFmpeg dependency"""
     
     def __init__(self):
         self.target_sample_rate = 16000  # Whisper's preferred sample rate
-        self.available_processors = self._check_available_processors()
+        # Library availability is fixed at import time, so is the best choice
+        self.available_processors = _AVAILABLE_PROCESSORS
+        self._best_processor = _BEST_PROCESSOR
         
         # Use startup device check instead of redundant GPU detection
-        import os
         self.device = os.environ.get('WHISPER_DEVICE', 'cpu')
+        logger.debug("AudioProcessor: sr=%d, best=%s, device=%s",
+                     self.target_sample_rate, self._best_processor, self.device)
         
-        # Concise console summary
-        proc_flags = ",".join([
-            f"librosa={int(self.available_processors['librosa'])}",
-            f"soundfile={int(self.available_processors['soundfile'])}",
-            f"pydub={int(self.available_processors['pydub'])}",
-            f"scipy={int(self.available_processors['scipy'])}"
-        ])
-        print(f"[Audio] sr=16000, procs[{proc_flags}], device={self.device}")
-        
-    def _check_available_processors(self) -> Dict[str, bool]:
-        """Check which audio processing libraries are available"""
-        return {
-            'librosa': LIBROSA_AVAILABLE,
-            'soundfile': SOUNDFILE_AVAILABLE,  
-            'pydub': PYDUB_AVAILABLE,
-            'pydub_with_ffmpeg': PYDUB_AVAILABLE and FFMPEG_AVAILABLE,
-            'scipy': SCIPY_AVAILABLE
-        }
-    
-    
     def get_best_processor(self) -> str:
         """Get the best available audio processor"""
-        if self.available_processors['librosa']:
-            return 'librosa'
-        elif self.available_processors['soundfile']:
-            return 'soundfile'
-        elif self.available_processors['pydub']:
-            return 'pydub'
-        elif self.available_processors['scipy']:
-            return 'scipy'
-        else:
+        if self._best_processor is None:
             raise RuntimeError("No audio processing library available. Install librosa, soundfile, pydub, or scipy")
+        return self._best_processor
 
     def process_audio_for_whisper(self, audio_data: bytes, 
                                  original_format: str = 'webm') -> Tuple[np.ndarray, int]:
@@ -104,73 +218,111 @@ class AudioProcessor:
         Process audio data for Whisper transcription
         Returns: (audio_array, sample_rate)
         """
-        logger.info(f"Processing audio for Whisper: {len(audio_data)} bytes, format: {original_format}")
+        logger.info("Processing audio for Whisper: %d bytes, format: %s", len(audio_data), original_format)
         processor = self.get_best_processor()
-        logger.info(f"Using processor: {processor}")
+        logger.info("Using processor: %s", processor)
+        
+        # Plain 16-bit PCM WAV needs no decoder library at all
+        pcm = _parse_pcm16_wav(audio_data)
+        if pcm is not None:
+            samples, channels, sample_rate = pcm
+            audio_array = samples.astype(np.float32)
+            audio_array *= 1.0 / 32768.0
+            if channels > 1:
+                audio_array = audio_array.reshape(-1, channels)
+            return self._to_whisper_format(audio_array, sample_rate)
+        
+        # Only try the libraries that can decode the container the bytes are in
+        detected_format = _detect_format(audio_data)
+        candidates = _FORMAT_PROCESSORS.get(detected_format, _FALLBACK_PROCESSORS)
+        methods = {
+            'soundfile': lambda: self._process_with_soundfile(audio_data),
+            'scipy': lambda: self._process_with_scipy(audio_data),
+            'pydub': lambda: self._process_with_pydub(audio_data, detected_format or original_format),
+            'librosa': lambda: self._process_with_librosa(audio_data),
+        }
         
-        # Try a robust sequence regardless of what's "best"
         errors = []
-        for method in (
-            lambda: self._process_with_soundfile(audio_data),
-            lambda: self._process_with_scipy(audio_data),
-            lambda: self._process_with_pydub(audio_data, original_format),
-            lambda: self._process_with_librosa(audio_data),
-        ):
+        for name in candidates:
+            if not self.available_processors[name]:
+                continue
             try:
-                return method()
+                return methods[name]()
             except Exception as e:
                 errors.append(str(e))
-                logger.warning(f"Processor attempt failed: {e}")
+                logger.warning("Processor attempt failed: %s", e)
+        if not errors:
+            errors.append(f"no installed processor handles {detected_format or original_format} audio")
         raise RuntimeError(f"All processors failed: {' | '.join(errors)}")
 
+    def process_audio_stream(self, stream, original_format: str = 'webm') -> Tuple[np.ndarray, int]:
+        """
+        Process an uploaded audio file object for Whisper transcription
+        
+        libsndfile decodes WAV/FLAC/OGG straight from the file object, so the
+        upload is never copied into a bytes buffer; other formats are read
+        and go through process_audio_for_whisper.
+        Returns: (audio_array, sample_rate)
+        """
+        if SOUNDFILE_AVAILABLE:
+            start = stream.tell()
+            try:
+                with sf.SoundFile(stream) as sound_file:
+                    sample_rate = sound_file.samplerate
+                    audio_array = sound_file.read(dtype='float32')
+                return self._to_whisper_format(audio_array, sample_rate)
+            except Exception as e:
+                logger.debug("Streaming soundfile decode failed (%s), buffering upload", e)
+                stream.seek(start)
+        return self.process_audio_for_whisper(stream.read(), original_format)
+
     def _process_with_librosa(self, audio_data: bytes) -> Tuple[np.ndarray, int]:
         """Process audio using librosa (best option - handles all formats)"""
         logger.info("Processing audio with librosa")
         try:
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.webm', delete=False) as tmp_file:
-                tmp_file.write(audio_data)
-                tmp_path = tmp_file.name
-                logger.debug(f"Saved audio to temporary file: {tmp_path}")
-            
+            # Formats libsndfile understands (WAV/FLAC/OGG) decode straight
+            # from memory; anything else needs audioread, which wants a path
             try:
-                # Load and resample with librosa
-                logger.info(f"Loading audio with librosa, target sample rate: {self.target_sample_rate}Hz")
+                logger.info("Loading audio with librosa, target sample rate: %dHz", self.target_sample_rate)
                 audio_array, sample_rate = librosa.load(
-                    tmp_path,
+                    io.BytesIO(audio_data),
                     sr=self.target_sample_rate,
                     mono=True
                 )
-                
-                logger.info(f"librosa processing complete: {len(audio_array)} samples at {sample_rate}Hz")
-                return audio_array.astype(np.float32), sample_rate
-                
-            finally:
-                os.unlink(tmp_path)
-                logger.debug(f"Cleaned up temporary file: {tmp_path}")
+            except Exception as e:
+                logger.debug("In-memory librosa decode failed (%s), using temporary file", e)
+                audio_array, sample_rate = self._librosa_load_via_tempfile(audio_data)
+            
+            logger.info("librosa processing complete: %d samples at %dHz", len(audio_array), sample_rate)
+            return audio_array.astype(np.float32), sample_rate
                 
         except Exception as e:
-            logger.error(f"librosa processing failed: {e}")
+            logger.error("librosa processing failed: %s", e)
             raise RuntimeError(f"librosa processing failed: {e}")
 
+    def _librosa_load_via_tempfile(self, audio_data: bytes) -> Tuple[np.ndarray, int]:
+        """Decode through a temporary file so librosa can hand it to audioread"""
+        with tempfile.NamedTemporaryFile(suffix='.webm', delete=False) as tmp_file:
+            tmp_file.write(audio_data)
+            tmp_path = tmp_file.name
+            logger.debug("Saved audio to temporary file: %s", tmp_path)
+        
+        try:
+            return librosa.load(
+                tmp_path,
+                sr=self.target_sample_rate,
+                mono=True
+            )
+        finally:
+            os.unlink(tmp_path)
+            logger.debug("Cleaned up temporary file: %s", tmp_path)
+
     def _process_with_soundfile(self, audio_data: bytes) -> Tuple[np.ndarray, int]:
         """Process audio using soundfile (good for WAV, FLAC)"""
         try:
             # Try to read directly from bytes
-            audio_array, sample_rate = sf.read(io.BytesIO(audio_data))
-            
-            # Convert to mono if stereo
-            if len(audio_array.shape) > 1:
-                audio_array = np.mean(audio_array, axis=1)
-            
-            # Resample if needed (basic resampling)
-            if sample_rate != self.target_sample_rate:
-                audio_array = self._simple_resample(
-                    audio_array, sample_rate, self.target_sample_rate
-                )
-                sample_rate = self.target_sample_rate
-            
-            return audio_array.astype(np.float32), sample_rate
+            audio_array, sample_rate = sf.read(io.BytesIO(audio_data), dtype='float32')
+            return self._to_whisper_format(audio_array, sample_rate)
             
         except Exception as e:
             raise RuntimeError(f"soundfile processing failed: {e}")
@@ -179,10 +331,10 @@ class AudioProcessor:
         """Process audio using pydub"""
         try:
             # Determine format
-            if format_hint in ['webm', 'ogg']:
+            if format_hint in ['webm', 'ogg', 'mp4']:
                 if not FFMPEG_AVAILABLE:
-                    raise RuntimeError("FFmpeg required for WebM/OGG with pydub")
-                audio_segment = AudioSegment.from_file(io.BytesIO(audio_data), format='webm')
+                    raise RuntimeError("FFmpeg required for WebM/OGG/MP4 with pydub")
+                audio_segment = AudioSegment.from_file(io.BytesIO(audio_data), format=format_hint)
             elif format_hint == 'mp3':
                 if not FFMPEG_AVAILABLE:
                     raise RuntimeError("FFmpeg required for MP3 with pydub")
@@ -191,13 +343,14 @@ class AudioProcessor:
                 # Try WAV (doesn't need FFmpeg)
                 audio_segment = AudioSegment.from_wav(io.BytesIO(audio_data))
             
-            # Convert to mono and resample
-            audio_segment = audio_segment.set_channels(1)
+            # Convert to mono 16-bit and resample
+            audio_segment = audio_segment.set_channels(1).set_sample_width(2)
             audio_segment = audio_segment.set_frame_rate(self.target_sample_rate)
             
-            # Convert to numpy array
-            audio_array = np.array(audio_segment.get_array_of_samples(), dtype=np.float32)
-            audio_array = audio_array / (2**15)  # Normalize to [-1, 1]
+            # View the raw PCM bytes as int16 instead of going through array.array
+            audio_int16 = np.frombuffer(audio_segment.raw_data, dtype=np.int16)
+            audio_array = audio_int16.astype(np.float32)
+            audio_array *= 1.0 / 32768.0  # Normalize to [-1, 1]
             
             return audio_array, self.target_sample_rate
             
@@ -220,7 +373,7 @@ class AudioProcessor:
             
             # Convert to mono if stereo
             if len(audio_array.shape) > 1:
-                audio_array = np.mean(audio_array, axis=1)
+                audio_array = self._downmix_to_mono(audio_array)
             
             # Simple resampling if needed
             if sample_rate != self.target_sample_rate:
@@ -234,11 +387,44 @@ class AudioProcessor:
         except Exception as e:
             raise RuntimeError(f"scipy processing failed: {e}")
 
+    def _to_whisper_format(self, audio_array: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, int]:
+        """Downmix decoded float audio to mono and resample it to the target rate"""
+        # Convert to mono if stereo
+        if len(audio_array.shape) > 1:
+            audio_array = self._downmix_to_mono(audio_array)
+        
+        # Resample if needed (basic resampling)
+        if sample_rate != self.target_sample_rate:
+            audio_array = self._simple_resample(
+                audio_array, sample_rate, self.target_sample_rate
+            )
+            sample_rate = self.target_sample_rate
+        
+        return audio_array.astype(np.float32, copy=False), sample_rate
+
+    @staticmethod
+    def _downmix_to_mono(audio_array: np.ndarray) -> np.ndarray:
+        """Average the channels of a (frames, channels) array in float32"""
+        if audio_array.shape[1] == 2:
+            mono = np.add(audio_array[:, 0], audio_array[:, 1], dtype=np.float32)
+            mono *= 0.5
+            return mono
+        return audio_array.mean(axis=1, dtype=np.float32)
+
     def _simple_resample(self, audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
-        """Simple linear interpolation resampling"""
+        """Resample audio, using a polyphase FIR filter when scipy is available
+        
+        resample_poly applies an anti-aliasing filter (48kHz -> 16kHz is a
+        plain up=1/down=3 decimation); linear interpolation is the fallback.
+        """
         if orig_sr == target_sr:
             return audio
         
+        if RESAMPLE_POLY_AVAILABLE:
+            up, down, taps = _resample_plan(orig_sr, target_sr)
+            resampled = resample_poly(audio, up, down, window=taps)
+            return resampled.astype(np.float32, copy=False)
+        
         # Calculate new length
         new_length = int(len(audio) * target_sr / orig_sr)
         
@@ -251,19 +437,18 @@ class AudioProcessor:
         return resampled.astype(np.float32)
 
     def create_wav_from_array(self, audio_array: np.ndarray, sample_rate: int) -> bytes:
-        """Convert numpy array to WAV bytes"""
-        # Convert to 16-bit PCM
-        audio_int16 = (audio_array * 32767).astype(np.int16)
-        
-        # Create WAV file in memory
-        wav_buffer = io.BytesIO()
-        with wave.open(wav_buffer, 'wb') as wav_file:
-            wav_file.setnchannels(1)  # mono
-            wav_file.setsampwidth(2)  # 16-bit
-            wav_file.setframerate(sample_rate)
-            wav_file.writeframes(audio_int16.tobytes())
+        """Convert numpy array to mono 16-bit PCM WAV bytes"""
+        # Scale and cast to 16-bit PCM in one pass, straight into the int16 buffer
+        audio_int16 = np.empty(audio_array.shape[0], dtype=np.int16)
+        np.multiply(audio_array, 32767, out=audio_int16, casting='unsafe')
         
-        return wav_buffer.getvalue()
+        data_size = audio_int16.nbytes
+        header = _WAV_HEADER.pack(
+            b'RIFF', 36 + data_size, b'WAVE',
+            b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,  # PCM, mono, 16-bit
+            b'data', data_size
+        )
+        return b''.join((header, memoryview(audio_int16)))
 
 
 # Flask/FastAPI integration examples
@@ -275,36 +460,188 @@ class WhisperAudioHandler:
         self.processor = AudioProcessor()
         
         # Use startup device check
-        import os
-        device = os.environ.get('WHISPER_DEVICE', 'cpu')
-        model_name = os.environ.get('WHISPER_MODEL', 'base')
-        print(f"[Whisper] device={device}, model={model_name}")
+        self.device = os.environ.get('WHISPER_DEVICE', 'cpu')
+        self.model_name = os.environ.get('WHISPER_MODEL', 'base')
+        print(f"[Whisper] device={self.device}, model={self.model_name}")
+        
+        # The model (and its CUDA context) is loaded on first use, so
+        # constructing the handler does not block server startup
+        self._whisper_model = None
+        self._model_lock = threading.Lock()
+        if WHISPER_BACKEND == 'faster' and not FASTER_WHISPER_AVAILABLE:
+            logger.warning("WHISPER_BACKEND=faster but faster-whisper is not installed; using openai-whisper")
+        self.backend = 'faster' if WHISPER_BACKEND == 'faster' and FASTER_WHISPER_AVAILABLE else 'openai'
+        self.whisper_available = self.backend == 'faster' or find_spec('whisper') is not None
+        if not self.whisper_available:
+            logger.warning("Whisper not available. Install with: pip install openai-whisper")
+            print("[Whisper] ERROR: module not available (pip install openai-whisper)")
         
-        # Import Whisper
+        # Micro-batching state; the worker thread starts with the first batched request
+        self._batch_queue = queue.Queue()
+        self._batch_worker = None
+    
+    @property
+    def whisper_model(self):
+        """Whisper model, loaded on first access"""
+        if self._whisper_model is None:
+            with self._model_lock:
+                if self._whisper_model is None:
+                    self._whisper_model = self._load_whisper_model()
+        return self._whisper_model
+    
+    def _load_whisper_model(self):
         try:
-            import whisper
-            logger.info(f"Loading Whisper model '{model_name}' on {device}")
-            print(f"[Whisper] loading model '{model_name}'...")
+            logger.info("Loading Whisper model '%s' on %s (%s)", self.model_name, self.device, self.backend)
+            print(f"[Whisper] loading model '{self.model_name}'...")
             
-            self.whisper_model = whisper.load_model(model_name, device=device)
-            self.whisper_available = True
+            if self.backend == 'faster':
+                from faster_whisper import WhisperModel
+                compute_type = 'float16' if self.device == 'cuda' else 'int8'
+                model = WhisperModel(self.model_name, device=self.device, compute_type=compute_type)
+            else:
+                # Reuses the checkpoint the gunicorn master loaded, on CPU
+                model = load_whisper_model(self.model_name, self.device)
             
-            logger.info(f"Whisper model loaded successfully on {device}")
-            print(f"[Whisper] ready on {device}")
+            logger.info("Whisper model loaded successfully on %s", self.device)
+            print(f"[Whisper] ready on {self.device}")
+            return model
             
-        except ImportError:
-            self.whisper_available = False
-            logger.warning("Whisper not available. Install with: pip install openai-whisper")
-            print("[Whisper] ERROR: module not available (pip install openai-whisper)")
         except Exception as e:
             self.whisper_available = False
-            logger.error(f"Failed to load Whisper model: {e}")
+            logger.error("Failed to load Whisper model: %s", e)
             print(f"[Whisper] ERROR loading model: {e}")
+            raise RuntimeError(f"Failed to load Whisper model: {e}")
+    
+    def _transcribe_array(self, audio_array: np.ndarray) -> Dict[str, Any]:
+        """Run Whisper on 16kHz mono audio
+        
+        Clips that fit in one 30s window are decoded directly from a single
+        log-mel spectrogram; transcribe() would run its sliding-window loop,
+        seek bookkeeping and temperature fallback for that one window anyway.
+        Longer clips go through transcribe().
+        """
+        if self.backend == 'faster':
+            return self._transcribe_faster(audio_array)
+        
+        import whisper
+        
+        model = self.whisper_model
+        fp16 = model.device.type == 'cuda'
+        if len(audio_array) > whisper.audio.N_SAMPLES:
+            return model.transcribe(audio_array, fp16=fp16)
+        
+        audio = whisper.pad_or_trim(audio_array)
+        mel = whisper.log_mel_spectrogram(audio, n_mels=model.dims.n_mels, device=model.device)
+        if WHISPER_BATCH_SIZE > 1:
+            decoded = self._submit_for_batch(mel).result()
+        else:
+            decoded = whisper.decode(model, mel, whisper.DecodingOptions(fp16=fp16))
+        
+        # Same silence rule transcribe() applies with its default thresholds
+        text = decoded.text
+        if decoded.no_speech_prob > 0.6 and decoded.avg_logprob < -1.0:
+            text = ""
+        
+        duration = len(audio_array) / self.processor.target_sample_rate
+        return {
+            "text": text,
+            "language": decoded.language,
+            "segments": [{
+                "id": 0,
+                "start": 0.0,
+                "end": duration,
+                "text": text,
+                "tokens": decoded.tokens,
+                "temperature": decoded.temperature,
+                "avg_logprob": decoded.avg_logprob,
+                "compression_ratio": decoded.compression_ratio,
+                "no_speech_prob": decoded.no_speech_prob,
+            }] if text else [],
+        }
+    
+    def _transcribe_faster(self, audio_array: np.ndarray) -> Dict[str, Any]:
+        """Run faster-whisper and return the same shape as whisper's transcribe()"""
+        segments, info = self.whisper_model.transcribe(audio_array, beam_size=1)
+        segment_list = [
+            {
+                "id": segment.id,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "tokens": segment.tokens,
+                "temperature": segment.temperature,
+                "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob,
+            }
+            for segment in segments
+        ]
+        return {
+            "text": "".join(segment["text"] for segment in segment_list),
+            "language": info.language,
+            "segments": segment_list,
+        }
+    
+    def _submit_for_batch(self, mel) -> Future:
+        """Queue a single-window mel for the batching worker"""
+        if self._batch_worker is None:
+            with self._model_lock:
+                if self._batch_worker is None:
+                    self._batch_worker = threading.Thread(
+                        target=self._batch_loop, name='whisper-batcher', daemon=True
+                    )
+                    self._batch_worker.start()
+        
+        future = Future()
+        self._batch_queue.put((mel, future))
+        return future
+    
+    def _batch_loop(self):
+        """Collect queued mels for up to WHISPER_BATCH_WAIT_MS and decode them together"""
+        import torch
+        import whisper
+        
+        while True:
+            batch = [self._batch_queue.get()]
+            deadline = time.monotonic() + WHISPER_BATCH_WAIT_MS / 1000.0
+            while len(batch) < WHISPER_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._batch_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            futures = [future for _, future in batch]
+            try:
+                model = self.whisper_model
+                options = whisper.DecodingOptions(fp16=model.device.type == 'cuda')
+                results = whisper.decode(model, torch.stack([mel for mel, _ in batch]), options)
+                for future, decoded in zip(futures, results):
+                    future.set_result(decoded)
+            except Exception as e:
+                logger.error("Batched Whisper decode failed for %d clips: %s", len(batch), e)
+                for future in futures:
+                    future.set_exception(e)
     
     def transcribe_audio_bytes(self, audio_bytes: bytes, 
                               format_hint: str = 'webm') -> Dict[str, Any]:
         """Transcribe audio bytes without FFmpeg"""
-        logger.info(f"Starting transcription: {len(audio_bytes)} bytes, format: {format_hint}")
+        logger.info("Starting transcription: %d bytes, format: %s", len(audio_bytes), format_hint)
+        return self._transcribe(
+            lambda: self.processor.process_audio_for_whisper(audio_bytes, format_hint)
+        )
+    
+    def transcribe_audio_stream(self, stream, format_hint: str = 'webm') -> Dict[str, Any]:
+        """Transcribe an uploaded audio file object, decoding from it directly where possible"""
+        logger.info("Starting transcription from upload stream, format: %s", format_hint)
+        return self._transcribe(
+            lambda: self.processor.process_audio_stream(stream, format_hint)
+        )
+    
+    def _transcribe(self, decode) -> Dict[str, Any]:
+        """Decode audio with the given callable and transcribe it"""
         try:
             if not self.whisper_available:
                 logger.error("Whisper not available for transcription")
@@ -312,16 +649,16 @@ class WhisperAudioHandler:
             
             # Process audio
             logger.info("Processing audio for transcription")
-            audio_array, sample_rate = self.processor.process_audio_for_whisper(
-                audio_bytes, format_hint
-            )
+            audio_array, sample_rate = decode()
             
             # Transcribe with Whisper
             logger.info("Starting Whisper transcription")
-            result = self.whisper_model.transcribe(audio_array)
+            result = self._transcribe_array(audio_array)
             
             transcript_text = result["text"].strip()
-            logger.info(f"Transcription complete: '{transcript_text[:100]}{'...' if len(transcript_text) > 100 else ''}'")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Transcription complete: '%s%s'", transcript_text[:100],
+                            '...' if len(transcript_text) > 100 else '')
             
             return {
                 "success": True,
@@ -336,7 +673,7 @@ class WhisperAudioHandler:
             }
             
         except Exception as e:
-            logger.error(f"Transcription failed: {e}")
+            logger.error("Transcription failed: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -344,14 +681,14 @@ class WhisperAudioHandler:
     
     def get_system_info(self) -> Dict[str, Any]:
         """Get audio processing capabilities"""
-        import os
         return {
             "whisper_available": self.whisper_available,
             "available_processors": self.processor.available_processors,
             "recommended_processor": self.processor.get_best_processor(),
             "target_sample_rate": self.processor.target_sample_rate,
             "device": os.environ.get('WHISPER_DEVICE', 'cpu'),
-            "model": os.environ.get('WHISPER_MODEL', 'base')
+            "model": os.environ.get('WHISPER_MODEL', 'base'),
+            "backend": self.backend
         }
 
 
@@ -369,10 +706,9 @@ def flask_example():
             return jsonify({"error": "No audio file provided"}), 400
         
         audio_file = request.files['audio']
-        audio_bytes = audio_file.read()
         format_hint = request.form.get('format', 'webm')
         
-        result = handler.transcribe_audio_bytes(audio_bytes, format_hint)
+        result = handler.transcribe_audio_stream(audio_file.stream, format_hint)
         
         if result.get('success'):
             return jsonify(result)
@@ -387,6 +723,7 @@ def flask_example():
 
 def fastapi_example():
     """FastAPI integration example"""
+    import asyncio
     from fastapi import FastAPI, File, UploadFile, Form
     from fastapi.responses import JSONResponse
     
@@ -398,8 +735,8 @@ def fastapi_example():
         audio: UploadFile = File(...),
         format_hint: str = Form("webm")
     ):
-        audio_bytes = await audio.read()
-        result = handler.transcribe_audio_bytes(audio_bytes, format_hint)
+        # Decode + Whisper block for seconds; keep the event loop accepting uploads
+        result = await asyncio.to_thread(handler.transcribe_audio_stream, audio.file, format_hint)
         
         if result.get('success'):
             return result
@@ -6,7 +6,8 @@ This script helps you get started quickly with the application.
 
 import os
 import sys
-import subprocess
+
+from app_lib.deps import has
 
 def set_environment_variables():
     """Set environment variables for the application"""
@@ -32,31 +33,37 @@ def set_environment_variables():
     os.environ['DB_NAME'] = 'doc_analyzer'
     print("✓ DB_NAME set to: doc_analyzer")
 
+# pip distribution name -> import name, where they differ
+_IMPORT_NAMES = {
+    'psycopg2-binary': 'psycopg2',
+    'python-docx': 'docx',
+    'PyPDF2': 'PyPDF2',
+}
+
 def check_dependencies():
     """Check if required packages are installed"""
-    print("\nChecking dependencies...")
-    
     required_packages = [
         'flask', 'psycopg2-binary', 'SQLAlchemy', 'Flask-SQLAlchemy', 'bcrypt', 'PyPDF2', 
         'python-docx', 'pytesseract', 'requests'
     ]
     
+    # Collected and written once: each print() is a separate console write
+    lines = ["", "Checking dependencies..."]
     missing_packages = []
     
     for package in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
-            print(f"✓ {package}")
-        except ImportError:
-            print(f"✗ {package} - Missing")
+        if has(_IMPORT_NAMES.get(package, package.lower().replace('-', '_'))):
+            lines.append(f"✓ {package}")
+        else:
+            lines.append(f"✗ {package} - Missing")
             missing_packages.append(package)
     
     if missing_packages:
-        print(f"\nMissing packages: {', '.join(missing_packages)}")
-        print("Please run: pip install -r requirements.txt")
-        return False
+        lines.append(f"\nMissing packages: {', '.join(missing_packages)}")
+        lines.append("Please run: pip install -r requirements.txt")
     
-    return True
+    sys.stdout.write("\n".join(lines) + "\n")
+    return not missing_packages
 
 def initialize_database():
     """Initialize the database with test users"""
@@ -82,11 +89,34 @@ def initialize_database():
         print("Make sure PostgreSQL is running and database 'doc_analyzer' exists")
         return False
 
+SETUP_BANNER = "\n".join([
+    "=" * 60,
+    "Oman Central Bank - Document Analyzer Setup",
+    "=" * 60,
+]) + "\n"
+
+SETUP_COMPLETE_BANNER = "\n".join([
+    "",
+    "=" * 60,
+    "✅ Setup completed successfully!",
+    "=" * 60,
+    "",
+    "You can now start the application with:",
+    "  python app.py",
+    "",
+    "Test user credentials:",
+    "  Username: finance_user, Password: finance123",
+    "  Username: policy_user, Password: policy123",
+    "  Username: currency_user, Password: currency123",
+    "  Username: legal_user, Password: legal123",
+    "  Username: itfinance_user, Password: itfinance123",
+    "",
+    "The application will be available at: http://localhost:5000",
+]) + "\n"
+
 def main():
     """Main setup function"""
-    print("=" * 60)
-    print("Oman Central Bank - Document Analyzer Setup")
-    print("=" * 60)
+    sys.stdout.write(SETUP_BANNER)
     
     # Set environment variables
     set_environment_variables()
@@ -101,18 +131,7 @@ def main():
         print("\n❌ Setup failed: Database initialization error")
         return 1
     
-    print("\n" + "=" * 60)
-    print("✅ Setup completed successfully!")
-    print("=" * 60)
-    print("\nYou can now start the application with:")
-    print("  python app.py")
-    print("\nTest user credentials:")
-    print("  Username: finance_user, Password: finance123")
-    print("  Username: policy_user, Password: policy123")
-    print("  Username: currency_user, Password: currency123")
-    print("  Username: legal_user, Password: legal123")
-    print("  Username: itfinance_user, Password: itfinance123")
-    print("\nThe application will be available at: http://localhost:5000")
+    sys.stdout.write(SETUP_COMPLETE_BANNER)
     
     return 0
 
@@ -7,28 +7,83 @@ Sets up Apache server to run the Flask application
 import subprocess
 import sys
 import os
-import time
 import shutil
 from pathlib import Path
 
+# Common Apache install locations, probed in order when httpd is not on PATH
+APACHE_DIRS = (
+    "C:\\Apache24",
+    "C:\\Program Files\\Apache Software Foundation\\Apache2.4",
+    "C:\\Program Files (x86)\\Apache Software Foundation\\Apache2.4",
+    "C:\\xampp\\apache",
+    "C:\\wamp64\\bin\\apache\\apache2.4.54",
+)
+
+TH32CS_SNAPPROCESS = 0x00000002
+
+def running_process_names():
+    """Yield the executable name of every running process
+    
+    Walks a Toolhelp32 process snapshot in-process instead of spawning
+    cmd.exe, tasklist.exe and findstr.exe.
+    """
+    import ctypes
+    from ctypes import wintypes
+    
+    class PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ('dwSize', wintypes.DWORD),
+            ('cntUsage', wintypes.DWORD),
+            ('th32ProcessID', wintypes.DWORD),
+            ('th32DefaultHeapID', ctypes.c_size_t),
+            ('th32ModuleID', wintypes.DWORD),
+            ('cntThreads', wintypes.DWORD),
+            ('th32ParentProcessID', wintypes.DWORD),
+            ('pcPriClassBase', wintypes.LONG),
+            ('dwFlags', wintypes.DWORD),
+            ('szExeFile', wintypes.WCHAR * 260),
+        ]
+    
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+    kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    
+    snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if snapshot == wintypes.HANDLE(-1).value:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        found = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+        while found:
+            yield entry.szExeFile
+            found = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+    finally:
+        kernel32.CloseHandle(snapshot)
+
 class WindowsApacheManager:
     def __init__(self):
         self.project_root = Path(__file__).parent.absolute()
         self.apache_config = self.project_root / "apache" / "cbo-flask.conf"
         self.htaccess_file = self.project_root / "apache" / ".htaccess"
         
-    def run_command(self, command, shell=True):
-        """Run a shell command and return the result"""
+    def run_command(self, argv):
+        """Run a command (argv list, no shell) and return (success, stdout or stderr)"""
         try:
-            result = subprocess.run(command, shell=shell, capture_output=True, text=True, check=True)
+            result = subprocess.run(argv, capture_output=True, text=True)
+        except OSError as e:
+            # Executable not found / not runnable
+            return False, str(e)
+        if result.returncode == 0:
             return True, result.stdout
-        except subprocess.CalledProcessError as e:
-            return False, e.stderr
+        return False, result.stderr
     
     def check_apache_installed(self):
         """Check if Apache is installed"""
-        success, output = self.run_command("httpd -v")
-        if success:
+        if shutil.which("httpd"):
             print("✅ Apache is installed")
             return True
         else:
@@ -37,8 +92,7 @@ class WindowsApacheManager:
     
     def check_apache_running(self):
         """Check if Apache is running"""
-        success, output = self.run_command("tasklist | findstr httpd")
-        if success and "httpd.exe" in output:
+        if any(name.lower() == "httpd.exe" for name in running_process_names()):
             print("✅ Apache is running")
             return True
         else:
@@ -50,14 +104,14 @@ class WindowsApacheManager:
         print("🚀 Starting Apache...")
         
         # Try to start Apache service
-        success, output = self.run_command("net start Apache2.4")
+        success, output = self.run_command(["net", "start", "Apache2.4"])
         if success:
             print("✅ Apache started successfully!")
             return True
         else:
             # Try alternative method
             print("Trying alternative start method...")
-            success, output = self.run_command("httpd -k start")
+            success, output = self.run_command(["httpd", "-k", "start"])
             if success:
                 print("✅ Apache started successfully!")
                 return True
@@ -70,14 +124,14 @@ class WindowsApacheManager:
         print("🛑 Stopping Apache...")
         
         # Try to stop Apache service
-        success, output = self.run_command("net stop Apache2.4")
+        success, output = self.run_command(["net", "stop", "Apache2.4"])
         if success:
             print("✅ Apache stopped successfully!")
             return True
         else:
             # Try alternative method
             print("Trying alternative stop method...")
-            success, output = self.run_command("httpd -k stop")
+            success, output = self.run_command(["httpd", "-k", "stop"])
             if success:
                 print("✅ Apache stopped successfully!")
                 return True
@@ -87,6 +141,8 @@ class WindowsApacheManager:
     
     def restart_apache(self):
         """Restart Apache service"""
+        import time  # only the restart command needs it
+        
         print("🔄 Restarting Apache...")
         self.stop_apache()
         time.sleep(2)
@@ -97,10 +153,9 @@ class WindowsApacheManager:
         print("📦 Installing Apache...")
         
         # Check if Chocolatey is available
-        success, output = self.run_command("choco --version")
-        if success:
+        if shutil.which("choco"):
             print("Using Chocolatey to install Apache...")
-            success, output = self.run_command("choco install apache-httpd -y")
+            success, output = self.run_command(["choco", "install", "apache-httpd", "-y"])
             if success:
                 print("✅ Apache installed successfully!")
                 return True
@@ -118,20 +173,13 @@ class WindowsApacheManager:
         """Set up Apache configuration"""
         print("⚙️ Setting up Apache configuration...")
         
-        # Find Apache installation directory
-        apache_dirs = [
-            "C:\\Apache24",
-            "C:\\Program Files\\Apache Software Foundation\\Apache2.4",
-            "C:\\Program Files (x86)\\Apache Software Foundation\\Apache2.4",
-            "C:\\xampp\\apache",
-            "C:\\wamp64\\bin\\apache\\apache2.4.54"
-        ]
-        
-        apache_dir = None
-        for dir_path in apache_dirs:
-            if os.path.exists(dir_path):
-                apache_dir = dir_path
-                break
+        # Find Apache installation directory: <apache>/bin/httpd.exe on PATH
+        # covers Chocolatey/scoop/winget and custom installs
+        httpd = shutil.which("httpd")
+        if httpd:
+            apache_dir = str(Path(httpd).resolve().parent.parent)
+        else:
+            apache_dir = next((d for d in APACHE_DIRS if os.path.isdir(d)), None)
         
         if not apache_dir:
             print("❌ Apache installation directory not found")
@@ -145,29 +193,29 @@ class WindowsApacheManager:
         
         # Copy configuration file
         conf_dir = Path(apache_dir) / "conf"
-        if conf_dir.exists():
+        httpd_conf = conf_dir / "httpd.conf"
+        if httpd_conf.is_file():
             # Copy our configuration
             target_conf = conf_dir / "cbo-flask.conf"
             shutil.copy2(self.apache_config, target_conf)
             print(f"✅ Configuration copied to: {target_conf}")
             
-            # Update httpd.conf to include our configuration
-            httpd_conf = conf_dir / "httpd.conf"
-            if httpd_conf.exists():
-                with open(httpd_conf, 'r') as f:
-                    content = f.read()
-                
-                if "cbo-flask.conf" not in content:
-                    with open(httpd_conf, 'a') as f:
-                        f.write("\n# Include CBO Flask configuration\n")
-                        f.write("Include conf/cbo-flask.conf\n")
-                    print("✅ Added include directive to httpd.conf")
-                else:
-                    print("✅ Configuration already included in httpd.conf")
+            # Update httpd.conf to include our configuration; after read()
+            # the position is at the end, so the same handle appends
+            with open(httpd_conf, 'r+') as f:
+                already_included = "cbo-flask.conf" in f.read()
+                if not already_included:
+                    f.write("\n# Include CBO Flask configuration\n"
+                            "Include conf/cbo-flask.conf\n")
+            
+            if already_included:
+                print("✅ Configuration already included in httpd.conf")
+            else:
+                print("✅ Added include directive to httpd.conf")
             
             return True
         else:
-            print(f"❌ Apache conf directory not found: {conf_dir}")
+            print(f"❌ Apache httpd.conf not found: {httpd_conf}")
             return False
     
     def start_flask_app(self):
@@ -177,14 +225,17 @@ class WindowsApacheManager:
         # Change to project directory
         os.chdir(self.project_root)
         
-        # Start Flask app
-        success, output = self.run_command("python app.py")
-        if success:
-            print("✅ Flask application started!")
-            return True
-        else:
-            print(f"❌ Failed to start Flask application: {output}")
+        # Run Flask in the foreground until it exits. os.execv would not
+        # replace this process on Windows, only spawn a detached one.
+        try:
+            returncode = subprocess.call([sys.executable, "app.py"])
+        except OSError as e:
+            print(f"❌ Failed to start Flask application: {e}")
             return False
+        if returncode != 0:
+            print(f"❌ Flask application exited with code {returncode}")
+            return False
+        return True
     
     def setup_complete(self):
         """Complete setup process"""
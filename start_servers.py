@@ -1,84 +1,136 @@
 #!/usr/bin/env python3
 """
-Start both Apache and Flask servers
+Start the application servers
+
+Usage: python start_servers.py [apache] [flask] [node] [react]
+With no arguments Apache and Flask are started.
 """
 
+import shutil
 import subprocess
 import sys
-import os
 import time
-import threading
 from pathlib import Path
 
-def start_flask():
-    """Start Flask application in a separate thread"""
-    print("🐍 Starting Flask application...")
-    os.chdir(Path(__file__).parent)
+PROJECT_ROOT = Path(__file__).parent
+
+# Long-running child processes: name -> (label, argv, working directory)
+SERVICES = {
+    'flask': ("🐍 Flask application", [sys.executable, "app.py"], PROJECT_ROOT),
+    'node': ("🟢 Node API server", ["node", "server.js"], PROJECT_ROOT),
+    'react': ("⚛️  React dev server", ["npm", "start"], PROJECT_ROOT / "frontend"),
+}
+
+# Apache runs as a system service rather than as a child of this script
+SYSTEM_SERVICES = ('apache',)
+
+DEFAULT_SERVICES = ('apache', 'flask')
+
+def start_service(name):
+    """Start one of SERVICES as a child process"""
+    label, argv, cwd = SERVICES[name]
+    print(f"{label} starting...")
+    # npm is a .cmd shim on Windows, which Popen only runs by full path
+    executable = shutil.which(argv[0]) or argv[0]
+    return subprocess.Popen([executable] + argv[1:], cwd=cwd)
+
+def wait_for_first_exit(processes):
+    """Poll the children until one exits; returns (name, returncode)
     
-    try:
-        # Start Flask app
-        subprocess.run([sys.executable, "app.py"], check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Flask application failed to start: {e}")
-    except KeyboardInterrupt:
-        print("🛑 Flask application stopped")
+    Polling notices whichever child stops first, not only the first one
+    started. With no children this waits until Ctrl+C.
+    """
+    while True:
+        for name, process in processes.items():
+            returncode = process.poll()
+            if returncode is not None:
+                return name, returncode
+        time.sleep(0.5)
+
+def stop_services(processes):
+    """Terminate the children still running, killing any that ignore it"""
+    for process in processes.values():
+        if process.poll() is None:
+            process.terminate()
+    for name, process in processes.items():
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        print(f"🛑 {SERVICES[name][0]} stopped")
 
 def start_apache():
     """Start Apache server"""
     print("🚀 Starting Apache server...")
-    
+
     try:
         # Try to start Apache service
         subprocess.run(["net", "start", "Apache2.4"], check=True)
         print("✅ Apache started successfully!")
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, OSError):
         try:
             # Try alternative method
             subprocess.run(["httpd", "-k", "start"], check=True)
             print("✅ Apache started successfully!")
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, OSError) as e:
             print(f"❌ Failed to start Apache: {e}")
             print("Please make sure Apache is installed and configured")
 
-def main():
-    print("🎯 Starting CBO Flask Application with Apache")
+def stop_apache():
+    """Stop Apache server"""
+    try:
+        subprocess.run(["net", "stop", "Apache2.4"], check=True)
+        print("✅ Apache stopped")
+    except (subprocess.CalledProcessError, OSError):
+        try:
+            subprocess.run(["httpd", "-k", "stop"], check=True)
+            print("✅ Apache stopped")
+        except (subprocess.CalledProcessError, OSError):
+            print("❌ Failed to stop Apache")
+
+def main(argv=None):
+    names = list(argv if argv is not None else sys.argv[1:]) or list(DEFAULT_SERVICES)
+    unknown = [name for name in names if name not in SERVICES and name not in SYSTEM_SERVICES]
+    if unknown:
+        print(f"❌ Unknown service(s): {', '.join(unknown)}")
+        print(f"Available: {', '.join(SYSTEM_SERVICES + tuple(SERVICES))}")
+        return 1
+
+    print(f"🎯 Starting CBO servers: {', '.join(names)}")
     print("=" * 50)
-    
-    # Start Apache
-    start_apache()
-    
-    # Wait a moment for Apache to start
-    time.sleep(2)
-    
-    # Start Flask in a separate thread
-    flask_thread = threading.Thread(target=start_flask, daemon=True)
-    flask_thread.start()
-    
+
+    if 'apache' in names:
+        start_apache()
+        # Wait a moment for Apache to start
+        time.sleep(2)
+
+    processes = {name: start_service(name) for name in names if name in SERVICES}
+
     print("\n✅ Servers started!")
-    print("🌐 Your application should now be available at:")
-    print("   http://localhost")
-    print("   http://localhost:80")
+    if 'apache' in names:
+        print("🌐 Your application should now be available at:")
+        print("   http://localhost")
+        print("   http://localhost:80")
     print("\n📝 Press Ctrl+C to stop all servers")
-    
+
+    exit_code = 0
     try:
-        # Keep the main thread alive
-        while True:
-            time.sleep(1)
+        name, returncode = wait_for_first_exit(processes)
+        if returncode == 0:
+            print(f"\nℹ️  {SERVICES[name][0]} exited")
+        else:
+            print(f"\n❌ {SERVICES[name][0]} exited with code {returncode}")
+            exit_code = 1
+        print("🛑 Stopping the remaining servers...")
     except KeyboardInterrupt:
         print("\n🛑 Stopping servers...")
-        
-        # Stop Apache
-        try:
-            subprocess.run(["net", "stop", "Apache2.4"], check=True)
-            print("✅ Apache stopped")
-        except subprocess.CalledProcessError:
-            try:
-                subprocess.run(["httpd", "-k", "stop"], check=True)
-                print("✅ Apache stopped")
-            except subprocess.CalledProcessError:
-                print("❌ Failed to stop Apache")
-        
-        print("👋 Goodbye!")
+    stop_services(processes)
+
+    if 'apache' in names:
+        stop_apache()
+    print("👋 Goodbye!")
+    return exit_code
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -6,6 +6,56 @@ Handles console prompts for optional features like RAG
 
 import sys
 import os
+import json
+import functools
+import sysconfig
+
+from app_lib.deps import missing
+
+# Results of the slow dependency probes, reused until packages change
+DEPS_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'omanchatbot', 'deps.json')
+
+def _environment_key() -> str:
+    """Identify the interpreter and the state of its site-packages"""
+    mtimes = []
+    for path in sorted({sysconfig.get_paths()['purelib'], sysconfig.get_paths()['platlib']}):
+        try:
+            # Installing or removing a package adds/removes entries here
+            mtimes.append(f"{path}:{os.stat(path).st_mtime_ns}")
+        except OSError:
+            mtimes.append(f"{path}:missing")
+    return "|".join([sys.executable] + mtimes)
+
+def _cached_on_disk(func):
+    """Persist a no-argument bool probe in DEPS_CACHE_PATH, keyed by _environment_key()"""
+    @functools.wraps(func)
+    def wrapper() -> bool:
+        key = _environment_key()
+        try:
+            with open(DEPS_CACHE_PATH, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        
+        entry = cache.get(func.__name__)
+        if isinstance(entry, dict) and entry.get('key') == key:
+            return entry['result']
+        
+        result = func()
+        cache[func.__name__] = {'key': key, 'result': result}
+        try:
+            os.makedirs(os.path.dirname(DEPS_CACHE_PATH), exist_ok=True)
+            tmp_path = f"{DEPS_CACHE_PATH}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, DEPS_CACHE_PATH)
+        except OSError:
+            pass
+        return result
+    return wrapper
+
+_YES = frozenset({'yes', 'y'})
+_NO = frozenset({'no', 'n'})
 
 def get_user_choice(prompt_text: str, default: str = "no") -> bool:
     """
@@ -18,19 +68,28 @@ def get_user_choice(prompt_text: str, default: str = "no") -> bool:
     Returns:
         True if user chooses 'yes', False otherwise
     """
+    # Nobody to answer (CI, service manager, pipe that stays open): don't block
+    if not sys.stdin.isatty():
+        print(f"{prompt_text} (non-interactive, using default: {default})")
+        return default.lower() in _YES
+    
+    prompt = f"{prompt_text} (yes/no) [{default}]: "
+    # After an invalid answer the hint goes out with the next prompt, in the
+    # single write (and flush) input() makes anyway
+    retry_prompt = "Please enter 'yes' or 'no'\n" + prompt
     while True:
         try:
-            choice = input(f"{prompt_text} (yes/no) [{default}]: ").strip().lower()
+            choice = input(prompt).strip().lower()
             
             if not choice:  # User pressed Enter
                 choice = default
             
-            if choice in ['yes', 'y']:
+            if choice in _YES:
                 return True
-            elif choice in ['no', 'n']:
+            elif choice in _NO:
                 return False
             else:
-                print("Please enter 'yes' or 'no'")
+                prompt = retry_prompt
                 continue
                 
         except KeyboardInterrupt:
@@ -38,7 +97,19 @@ def get_user_choice(prompt_text: str, default: str = "no") -> bool:
             sys.exit(0)
         except EOFError:
             print(f"\nUsing default choice: {default}")
-            return default.lower() in ['yes', 'y']
+            return default.lower() in _YES
+
+RAG_CHOICE_BANNER = "\n".join([
+    "",
+    "="*60,
+    "🤖 RAG Integration Configuration",
+    "="*60,
+    "RAG provides advanced document-based question answering with context-aware responses.",
+    "⚠️  RAG requires GPU or significant CPU resources and additional packages.",
+    "📦 Required packages: langchain, transformers, torch, sentence-transformers, deep-translator",
+    "🔧 Uses Falcon3-1B-Base model with multilingual support",
+    "="*60,
+]) + "\n"
 
 def configure_rag_choice() -> bool:
     """
@@ -47,27 +118,39 @@ def configure_rag_choice() -> bool:
     Returns:
         True if RAG should be enabled, False otherwise
     """
-    print("\n" + "="*60)
-    print("🤖 RAG Integration Configuration")
-    print("="*60)
-    print("RAG provides advanced document-based question answering with context-aware responses.")
-    print("⚠️  RAG requires GPU or significant CPU resources and additional packages.")
-    print("📦 Required packages: langchain, transformers, torch, sentence-transformers, deep-translator")
-    print("🔧 Uses Falcon3-1B-Base model with multilingual support")
-    print("="*60)
+    # The explanatory banner is only useful to someone watching a terminal
+    if sys.stdout.isatty():
+        sys.stdout.write(RAG_CHOICE_BANNER)
     
     return get_user_choice(
         "Do you want to enable RAG Integration functionality?",
         default="no"
     )
 
-def check_rag_dependencies() -> bool:
+# Import names of the packages the RAG Integration system needs
+RAG_MODULES = (
+    "langchain", "transformers", "torch", "sentence_transformers",
+    "faiss", "deep_translator", "pdfplumber", "pytesseract",
+)
+
+def check_rag_dependencies(deep: bool = False) -> bool:
     """
     Check if RAG Integration dependencies are available
     
+    Args:
+        deep: Actually import every package (catches broken installs, but
+            loads torch/transformers); the default only checks presence
+    
     Returns:
         True if dependencies are available, False otherwise
     """
+    if deep:
+        return _rag_dependencies_importable()
+    return not missing(RAG_MODULES)
+
+@_cached_on_disk
+def _rag_dependencies_importable() -> bool:
+    """Import every RAG dependency (slow; cached on disk per environment)"""
     try:
         import langchain
         import transformers
@@ -81,17 +164,171 @@ def check_rag_dependencies() -> bool:
     except ImportError:
         return False
 
+# Wheels downloaded for the RAG install, reused when the install is retried
+WHEEL_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'oman_wheels')
+
+RAG_REQUIREMENTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'requirements.txt')
+
+# Touched after a successful install; newer than RAG_REQUIREMENTS means
+# nothing has been added to the requirements since
+RAG_INSTALLED_SENTINEL = os.path.join(os.path.dirname(RAG_REQUIREMENTS), '.rag_installed')
+
+def _rag_install_current() -> bool:
+    """Whether the last successful install covers the current requirements"""
+    try:
+        return os.stat(RAG_INSTALLED_SENTINEL).st_mtime >= os.stat(RAG_REQUIREMENTS).st_mtime
+    except OSError:
+        return False
+
+def _pip_in_process(args: list, verbose: bool = False):
+    """
+    Run pip inside this interpreter, skipping a second Python start-up
+    
+    Returns pip's exit code, or None if pip's internal entry point is not
+    importable (it is not a public API).
+    """
+    try:
+        from pip._internal.cli.main import main as pip_main
+    except ImportError:
+        return None
+    
+    import contextlib
+    import io
+    
+    argv = sys.argv[:]
+    output = io.StringIO()
+    try:
+        with contextlib.ExitStack() as stack:
+            if not verbose:
+                stack.enter_context(contextlib.redirect_stdout(output))
+                stack.enter_context(contextlib.redirect_stderr(output))
+            try:
+                returncode = pip_main(args)
+            except SystemExit as e:
+                # sys.exit() / sys.exit(0) mean success, like the CLI's exit status
+                returncode = e.code if isinstance(e.code, int) else int(e.code is not None)
+    finally:
+        sys.argv = argv
+    
+    if returncode != 0:
+        sys.stdout.write(output.getvalue())
+    return returncode
+
+def _pip(args: list, verbose: bool = False) -> bool:
+    """Run one pip command; its output is only shown when verbose or on failure"""
+    returncode = _pip_in_process(args, verbose)
+    if returncode is not None:
+        return returncode == 0
+    
+    import subprocess
+    
+    if verbose:
+        return subprocess.run([sys.executable, "-m", "pip"] + args).returncode == 0
+    
+    result = subprocess.run(
+        [sys.executable, "-m", "pip"] + args,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    if result.returncode != 0:
+        sys.stdout.write(result.stdout)
+    return result.returncode == 0
+
+def _install_rag_deps(verbose: bool = False) -> bool:
+    """
+    pip install the requirements; True on success
+    
+    The wheels are downloaded into WHEEL_CACHE_DIR first, so the install
+    itself runs offline against that directory and a retry after a failed
+    install does not fetch torch and friends again.
+    """
+    print("📦 Installing RAG Integration dependencies...")
+    requirements = ["-r", RAG_REQUIREMENTS]
+    
+    installed = False
+    if _pip(["download", "--prefer-binary", "-d", WHEEL_CACHE_DIR] + requirements, verbose):
+        installed = _pip(["install", "--no-index", "--find-links", WHEEL_CACHE_DIR] + requirements, verbose)
+    if not installed:
+        # sdists may need build requirements that were not downloaded
+        installed = _pip(["install", "--prefer-binary", "--find-links", WHEEL_CACHE_DIR] + requirements, verbose)
+    
+    if installed:
+        try:
+            with open(RAG_INSTALLED_SENTINEL, 'a', encoding='utf-8'):
+                pass
+            os.utime(RAG_INSTALLED_SENTINEL)
+        except OSError:
+            pass
+        print("✅ RAG Integration dependencies installed successfully")
+    else:
+        print("❌ Failed to install RAG Integration dependencies")
+        print("⚠️  Continuing without RAG functionality")
+    return installed
+
+# Last interactive RAG answer, reused so repeat launches skip the prompt
+RAG_CHOICE_PATH = os.path.join(os.path.expanduser('~'), '.oman_rag_choice')
+
+# Seconds given to opt out when the RAG dependencies are already installed
+RAG_OPT_OUT_SECONDS = 2
+
+def _preset_rag_choice():
+    """RAG choice from OMAN_RAG ('1'/'0') or the saved answer, else None"""
+    value = os.environ.get('OMAN_RAG')
+    if value in ('1', '0'):
+        print(f"⚙️  Using OMAN_RAG={value}")
+        return value == '1'
+    
+    try:
+        with open(RAG_CHOICE_PATH, 'r', encoding='utf-8') as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    if value not in ('1', '0'):
+        return None
+    print(f"⚙️  Using saved RAG choice from {RAG_CHOICE_PATH} (set OMAN_RAG=0/1 or delete it to change)")
+    return value == '1'
+
+def _save_rag_choice(enable_rag: bool):
+    try:
+        with open(RAG_CHOICE_PATH, 'w', encoding='utf-8') as f:
+            f.write('1' if enable_rag else '0')
+    except OSError:
+        pass
+
+def _confirm_enable_rag() -> bool:
+    """
+    RAG dependencies are present: enable RAG unless the user presses Enter
+    within RAG_OPT_OUT_SECONDS
+    
+    Windows consoles cannot select() on stdin, so there (and when stdin is
+    not a terminal) this falls back to the blocking prompt.
+    """
+    if os.name == 'nt' or not sys.stdin.isatty():
+        return configure_rag_choice()
+    
+    import select
+    print(f"✅ RAG dependencies found - enabling RAG (press Enter within {RAG_OPT_OUT_SECONDS}s to disable)")
+    ready, _, _ = select.select([sys.stdin], [], [], RAG_OPT_OUT_SECONDS)
+    if ready:
+        sys.stdin.readline()
+        return False
+    return True
+
 def main():
     """Main configuration function"""
     print("\n🚀 Oman Central Bank Document Analyzer - Startup Configuration")
     print("="*70)
     
+    # Probe first: a sentinel stat, else find_spec lookups (no package imports)
+    deps_found = _rag_install_current() or check_rag_dependencies()
+    
     # Configure RAG
-    enable_rag = configure_rag_choice()
+    enable_rag = _preset_rag_choice()
+    if enable_rag is None:
+        enable_rag = _confirm_enable_rag() if deps_found else configure_rag_choice()
+        _save_rag_choice(enable_rag)
     
     if enable_rag:
-        print("\n🔍 Checking RAG dependencies...")
-        if check_rag_dependencies():
+        if deps_found:
             print("✅ RAG dependencies found - RAG will be enabled")
             return True
         else:
@@ -105,16 +342,7 @@ def main():
             )
             
             if install_choice:
-                print("📦 Installing RAG Integration dependencies...")
-                import subprocess
-                try:
-                    subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
-                    print("✅ RAG Integration dependencies installed successfully")
-                    return True
-                except subprocess.CalledProcessError:
-                    print("❌ Failed to install RAG Integration dependencies")
-                    print("⚠️  Continuing without RAG functionality")
-                    return False
+                return _install_rag_deps(verbose='--verbose' in sys.argv[1:])
             else:
                 print("⚠️  Continuing without RAG functionality")
                 return False
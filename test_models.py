@@ -1,7 +1,78 @@
-import google.generativeai as genai
+import functools
+import importlib.util
+import json
 import os
+import sys
+import threading
+import time
 
-print("Available Models:")
-for m in genai.list_models():
-    print(f"- {m.name}: {m.supported_generation_methods}")
-print("\nIf you don't see gemini-pro in the list above, you may need to ensure your API key has access to it.")
\ No newline at end of file
+def _lazy_import(name):
+    """Import a module whose body only runs on first attribute access"""
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+# google.generativeai pulls in gRPC, protobuf and google-auth; defer that
+# until the models are actually listed (not when pytest collects this file)
+genai = _lazy_import('google.generativeai')
+
+# Last ListModels response, served while a refresh runs in the background
+MODELS_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'oman', 'models.json')
+
+def _fetch_models():
+    """Call ListModels and write the result to MODELS_CACHE_PATH"""
+    models = [
+        {'name': m.name, 'supported_generation_methods': list(m.supported_generation_methods)}
+        for m in genai.list_models()
+    ]
+    try:
+        os.makedirs(os.path.dirname(MODELS_CACHE_PATH), exist_ok=True)
+        tmp_path = f"{MODELS_CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(models, f)
+        os.replace(tmp_path, MODELS_CACHE_PATH)
+    except OSError:
+        pass
+    return models
+
+def _refresh_quietly():
+    try:
+        _fetch_models()
+    except Exception:
+        # Offline or unauthorised: keep serving the stale copy
+        pass
+
+@functools.lru_cache(maxsize=None)
+def cached_list_models(ttl=3600):
+    """
+    genai.list_models() as dicts, cached on disk (stale-while-revalidate)
+    
+    A cache younger than ttl seconds is returned as-is. An older one is
+    returned immediately while a background thread refreshes it; it is also
+    returned if the ListModels call cannot be made at all.
+    """
+    try:
+        age = time.time() - os.path.getmtime(MODELS_CACHE_PATH)
+        with open(MODELS_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return _fetch_models()
+    
+    if age > ttl:
+        threading.Thread(target=_refresh_quietly, name='list-models-refresh').start()
+    return cached
+
+def main():
+    print("Available Models:")
+    for m in cached_list_models():
+        print(f"- {m['name']}: {m['supported_generation_methods']}")
+    print("\nIf you don't see gemini-pro in the list above, you may need to ensure your API key has access to it.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+import json
+import sys
+import types
+
+import pytest
+
+import ingest_documents_gpu as ingest
+
+
+class FakeVectorStore:
+    def __init__(self):
+        self.saved_to = None
+
+    def save_local(self, folder):
+        self.saved_to = folder
+
+
+class FakeRAG:
+    def __init__(self, load_ok):
+        self.load_ok = load_ok
+        self.embeddings = None
+        self.vector_store = FakeVectorStore()
+        self.loaded = False
+        self.removed = None
+        self.parsed = None
+        self.incremental = None
+
+    def load_vector_store(self, folder):
+        self.loaded = True
+        return self.load_ok
+
+    def remove_documents(self, filenames):
+        self.removed = list(filenames)
+        return len(self.removed)
+
+    def ingest_parsed_documents(self, parsed, incremental=False):
+        self.parsed = sorted(item[0] for item in parsed)
+        self.incremental = incremental
+        return True
+
+    def get_stats(self):
+        return {}
+
+    def query(self, question, language):
+        return "ok", []
+
+
+@pytest.fixture
+def folder(tmp_path):
+    """Upload folder with three documents, a saved store and a flat manifest"""
+    for name in ('a.txt', 'b.txt', 'gone.txt'):
+        (tmp_path / name).write_text(f"contents of {name}")
+    documents = sorted(tmp_path.glob('*.txt'))
+    ingest.write_manifest(tmp_path, ingest.fingerprint_documents(documents, {}), 'flat')
+    (tmp_path / 'index.faiss').write_bytes(b'')
+    (tmp_path / 'index.pkl').write_bytes(b'')
+
+    # b.txt changed, gone.txt removed since that ingest
+    (tmp_path / 'b.txt').write_text("new, longer contents of b.txt")
+    (tmp_path / 'gone.txt').unlink()
+    return tmp_path
+
+
+def run_ingest(monkeypatch, folder, load_ok=True, extra_args=()):
+    rag = FakeRAG(load_ok)
+    parse_calls = []
+
+    def fake_parse_documents(documents):
+        names = sorted(p.name for p in documents)
+        parse_calls.append(names)
+        return [(name, 'text', '', '', '') for name in names]
+
+    fake_module = types.ModuleType('app_lib.rag_integration')
+    fake_module.initialize_rag_system = lambda: rag
+    monkeypatch.setitem(sys.modules, 'app_lib.rag_integration', fake_module)
+    monkeypatch.setattr(ingest, 'parse_documents', fake_parse_documents)
+    monkeypatch.setattr(ingest, 'check_gpu_availability', lambda: False)
+    monkeypatch.setattr(sys, 'argv', ['ingest_documents_gpu.py', '--upload_folder', str(folder), *extra_args])
+
+    ingest.main()
+    return rag, parse_calls
+
+
+def read_manifest(folder):
+    with open(folder / ingest.MANIFEST_NAME, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_incremental_reindexes_changed_and_drops_removed(monkeypatch, folder):
+    rag, parse_calls = run_ingest(monkeypatch, folder)
+
+    assert rag.loaded
+    assert parse_calls == [['b.txt']]
+    assert rag.removed == ['gone.txt']
+    assert rag.parsed == ['b.txt']
+    assert rag.incremental is True
+
+    manifest = read_manifest(folder)
+    assert manifest['index_kind'] == 'flat'
+    assert sorted(manifest['files']) == ['a.txt', 'b.txt']
+
+
+def test_load_failure_reindexes_every_document(monkeypatch, folder):
+    rag, parse_calls = run_ingest(monkeypatch, folder, load_ok=False)
+
+    assert rag.loaded
+    # Changed file first, then the unchanged ones once the load failed
+    assert parse_calls == [['b.txt'], ['a.txt']]
+    assert rag.removed is None
+    assert rag.parsed == ['a.txt', 'b.txt']
+    assert rag.incremental is False
+    assert sorted(read_manifest(folder)['files']) == ['a.txt', 'b.txt']
+
+
+@pytest.mark.parametrize('saved_kind', ['cagra', 'ivfpq', None])
+def test_non_flat_or_unknown_saved_layout_rebuilds(monkeypatch, folder, saved_kind):
+    files, _ = ingest.load_manifest(folder)
+    if saved_kind is None:
+        # Manifest written before the index kind was recorded
+        (folder / ingest.MANIFEST_NAME).write_text(json.dumps(files))
+    else:
+        ingest.write_manifest(folder, files, saved_kind)
+
+    rag, parse_calls = run_ingest(monkeypatch, folder)
+
+    assert not rag.loaded
+    assert parse_calls == [['a.txt', 'b.txt']]
+    assert rag.incremental is False
+    assert read_manifest(folder)['index_kind'] == 'flat'
+
+
+def test_unchanged_store_is_up_to_date(monkeypatch, tmp_path):
+    (tmp_path / 'a.txt').write_text("contents")
+    documents = [tmp_path / 'a.txt']
+    ingest.write_manifest(tmp_path, ingest.fingerprint_documents(documents, {}), 'flat')
+    (tmp_path / 'index.faiss').write_bytes(b'')
+
+    with pytest.raises(SystemExit) as exc:
+        run_ingest(monkeypatch, tmp_path)
+    assert exc.value.code == 0
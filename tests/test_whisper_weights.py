@@ -0,0 +1,54 @@
+import dataclasses
+
+import pytest
+
+np = pytest.importorskip('numpy')
+torch = pytest.importorskip('torch')
+pytest.importorskip('whisper')
+
+from whisper.model import ModelDimensions, Whisper
+
+from app_lib import whisper_weights
+from app_lib.whisper_service import WhisperService
+
+# Smallest model that still takes 30 s mel windows and the multilingual vocabulary
+TINY_DIMS = ModelDimensions(
+    n_mels=80, n_audio_ctx=1500, n_audio_state=64, n_audio_head=2, n_audio_layer=1,
+    n_vocab=51865, n_text_ctx=448, n_text_state=64, n_text_head=2, n_text_layer=1,
+)
+
+
+@pytest.fixture
+def checkpoint(tmp_path, monkeypatch):
+    """fp16 checkpoint laid out like the downloaded .pt files"""
+    monkeypatch.setenv('WHISPER_DEVICE', 'cpu')
+    monkeypatch.setattr(whisper_weights, '_PRELOADED_CHECKPOINTS', {})
+
+    model = Whisper(TINY_DIMS).half()
+    path = tmp_path / 'tiny-test.pt'
+    torch.save({'dims': dataclasses.asdict(TINY_DIMS), 'model_state_dict': model.state_dict()}, path)
+    return str(path)
+
+
+def test_preload_converts_weights_to_fp32(checkpoint):
+    assert whisper_weights.preload_whisper_weights(checkpoint)
+
+    state = whisper_weights._PRELOADED_CHECKPOINTS[checkpoint]['model_state_dict']
+    assert {tensor.dtype for tensor in state.values()} == {torch.float32}
+
+
+def test_preloaded_model_transcribes_on_cpu(checkpoint, tmp_path):
+    assert whisper_weights.preload_whisper_weights(checkpoint)
+    state = whisper_weights._PRELOADED_CHECKPOINTS[checkpoint]['model_state_dict']
+
+    service = WhisperService(str(tmp_path), model_name=checkpoint, device='cpu')
+    model = service._model
+
+    # Parameters alias the master's tensors rather than copying them
+    for name, tensor in model.state_dict().items():
+        assert tensor.dtype == torch.float32
+        assert tensor.data_ptr() == state[name].data_ptr()
+
+    # Same call as the warmup, which swallows its own errors
+    result = model.transcribe(np.zeros(16000, dtype=np.float32), fp16=False, temperature=0.0)
+    assert isinstance(result['text'], str)